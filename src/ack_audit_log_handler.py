@@ -6,7 +6,7 @@ from pydantic import Field
 import json
 import time
 from datetime import datetime, timedelta, timezone
-from alibabacloud_tea_util import models as util_models
+from sdk_defaults import DEFAULT_RUNTIME, EMPTY_HEADERS
 
 try:
     from .models import (
@@ -40,18 +40,14 @@ def _get_sls_client(ctx: Context, region_id: str):
 
 def _get_cs_client(ctx: Context, region_id: str):
     """从 lifespan providers 中获取指定区域的 CS 客户端。"""
-    lifespan_context = ctx.request_context.lifespan_context
-    if isinstance(lifespan_context, dict):
-        providers = lifespan_context.get("providers", {})
-        config = lifespan_context.get("config", {})
-    else:
-        providers = getattr(lifespan_context, "providers", {})
-        config = getattr(lifespan_context, "config", {}) if hasattr(lifespan_context, "config") else {}
-
-    cs_client_factory = providers.get("cs_client_factory")
-    if not cs_client_factory:
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    if not isinstance(lifespan_context, dict):
+        lifespan_context = {}
+    providers = lifespan_context.get("providers")
+    factory = providers.get("cs_client_factory") if isinstance(providers, dict) else None
+    if not factory:
         raise RuntimeError("cs_client_factory not available in runtime providers")
-    return cs_client_factory(region_id, config)
+    return factory(region_id, lifespan_context.get("config", {}))
 
 
 class ACKAuditLogHandler:
@@ -535,7 +531,7 @@ class ACKAuditLogHandler:
                 return result
                 
             except Exception as e:
-                logger.error(f"Failed to query audit logs: {e}")
+                logger.error("Failed to query audit logs: {}", e)
                 raise
 
         except Exception as e:
@@ -713,7 +709,7 @@ class ACKAuditLogHandler:
                         entries.append(log_data)
             except Exception as e:
                 execution_log.messages.append(f"Failed to parse response body, response: {response}, error: {e}")
-                logger.warning(f"Failed to parse response body, response: {response}, error: {e}")
+                logger.warning("Failed to parse response body, response: {}, error: {}", response, e)
 
             return {
                 "provider_query": query,
@@ -733,7 +729,7 @@ class ACKAuditLogHandler:
                     "status": "failed",
                     "error": str(e)
                 })
-            logger.error(f"SLS query failed: {e}")
+            logger.error("SLS query failed: {}", e)
             raise
 
     def _build_query(self, params: Dict[str, Any]) -> str:
@@ -767,12 +763,11 @@ class ACKAuditLogHandler:
         return query
 
     def _get_audit_sls_project_and_logstore(self, cluster_id) -> tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
-        runtime = util_models.RuntimeOptions()
-        headers = {}
+        runtime, headers = DEFAULT_RUNTIME, EMPTY_HEADERS
         request_id = None
         try:
             response = self.cs_client.get_cluster_audit_project_with_options(cluster_id, headers, runtime)
-            logger.info(f"_get_audit_sls_project_and_logstore response type: {type(response)}")
+            logger.info("_get_audit_sls_project_and_logstore response type: {}", type(response))
             # 提取 request_id
             if hasattr(response, 'headers') and response.headers:
                 request_id = response.headers.get('x-acs-request-id', 'N/A')
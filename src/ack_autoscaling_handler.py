@@ -2,6 +2,7 @@
 
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
+import asyncio
 import json
 import subprocess
 
@@ -60,12 +61,12 @@ HPA_MIN_REPLICAS_TARGET_UTIL_MEMORY = 0.5  # minReplicas 计算的 Memory 目标
 
 HPA_MAX_REPLICAS_FACTOR = 3  # maxReplicas 计算的放大系数
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ElasticityAnalysisResult:
     resource_analysis: List[WorkloadResourceProfile]
     autoscaling_recommended: bool
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WorkloadPrecheckResult:
     stable_for_hpa: bool
     replicas: int
@@ -80,13 +81,14 @@ from kubectl_handler import get_context_manager
 
 def _get_cs_client(ctx: Context, region: str):
     """从 lifespan providers 中获取指定区域的 CS 客户端。"""
-    lifespan_context = getattr(ctx.request_context, "lifespan_context", {}) or {}
-    providers = lifespan_context.get("providers", {}) if isinstance(lifespan_context, dict) else {}
-    config = lifespan_context.get("config", {}) if isinstance(lifespan_context, dict) else {}
-    cs_client_factory = providers.get("cs_client_factory") if isinstance(providers, dict) else None
-    if not cs_client_factory:
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    if not isinstance(lifespan_context, dict):
+        lifespan_context = {}
+    providers = lifespan_context.get("providers")
+    factory = providers.get("cs_client_factory") if isinstance(providers, dict) else None
+    if not factory:
         raise RuntimeError("cs_client_factory not available in runtime providers")
-    return cs_client_factory(region, config)
+    return factory(region, lifespan_context.get("config", {}))
 
 
 class ACKAutoscalingHandler:
@@ -199,7 +201,7 @@ class ACKAutoscalingHandler:
             )
 
         except Exception as e:
-            logger.error(f"Failed to analyze workload autoscaling: {e}")
+            logger.error("Failed to analyze workload autoscaling: {}", e)
             execution_log.error = str(e)
             execution_log.end_time = datetime.utcnow().isoformat() + "Z"
             execution_log.duration_ms = int(time.time() * 1000) - start_ms
@@ -416,23 +418,19 @@ class ACKAutoscalingHandler:
         now_sec = int(time.time())
         start_sec = now_sec - PROMETHEUS_QUERY_DURATION
 
-        cpu_result = await self._analyze_single_resource_volatility(
-            ctx, endpoint, cluster_id, namespace, workload_type, workload_name,
-            resource_type="cpu",
-            start_sec=start_sec,
-            end_sec=now_sec,
-            execution_log=execution_log,
-        )
+        # CPU 与 Memory 的分析互不依赖，并发查询 Prometheus
+        cpu_result, memory_result = await asyncio.gather(*(
+            self._analyze_single_resource_volatility(
+                ctx, endpoint, cluster_id, namespace, workload_type, workload_name,
+                resource_type=resource_type,
+                start_sec=start_sec,
+                end_sec=now_sec,
+                execution_log=execution_log,
+            )
+            for resource_type in ("cpu", "memory")
+        ))
         if cpu_result:
             results.append(cpu_result)
-
-        memory_result = await self._analyze_single_resource_volatility(
-            ctx, endpoint, cluster_id, namespace, workload_type, workload_name,
-            resource_type="memory",
-            start_sec=start_sec,
-            end_sec=now_sec,
-            execution_log=execution_log,
-        )
         if memory_result:
             results.append(memory_result)
 
@@ -583,11 +581,13 @@ class ACKAutoscalingHandler:
             now_sec = int(time.time())
             start_sec = now_sec - PROMETHEUS_QUERY_DURATION
 
-            cpu_samples = await self._query_resource_time_series_with_timestamp(
-                endpoint, cluster_id, namespace, workload_name, "cpu", start_sec, now_sec, execution_log
-            )
-            memory_samples = await self._query_resource_time_series_with_timestamp(
-                endpoint, cluster_id, namespace, workload_name, "memory", start_sec, now_sec, execution_log
+            cpu_samples, memory_samples = await asyncio.gather(
+                self._query_resource_time_series_with_timestamp(
+                    endpoint, cluster_id, namespace, workload_name, "cpu", start_sec, now_sec, execution_log
+                ),
+                self._query_resource_time_series_with_timestamp(
+                    endpoint, cluster_id, namespace, workload_name, "memory", start_sec, now_sec, execution_log
+                ),
             )
 
             # 提取纯数值列表用于分位数计算
@@ -714,7 +714,7 @@ class ACKAutoscalingHandler:
             )
 
         except Exception as e:
-            logger.error(f"HPA recommendation analysis failed: {e}")
+            logger.error("HPA recommendation analysis failed: {}", e)
             execution_log.warnings.append(f"HPA recommendation analysis failed: {str(e)}")
             return HPARecommendation(recommended=False, message=f"HPA 推荐分析失败: {str(e)}")
 
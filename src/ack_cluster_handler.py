@@ -5,14 +5,25 @@ This module provides management and query functionality for Alibaba Cloud Contai
 including cluster listing, node pool management, node queries, and task tracking operations.
 """
 
+import asyncio
+import contextlib
+import contextvars
+import copy
+import hashlib
+import random
 from enum import Enum
-from typing import Annotated, Dict, Any, Optional, List
-from datetime import datetime, timezone
+from typing import Annotated, Awaitable, Callable, Dict, Any, Optional, List, Tuple
+from datetime import date, datetime, timezone
+from decimal import Decimal
 from fastmcp import FastMCP, Context
 from loguru import logger
+from cachetools import LRUCache, TTLCache
 from alibabacloud_cs20151215 import models as cs20151215_models
+from alibabacloud_cs20151215.client import Client as CS20151215Client
 from alibabacloud_tea_openapi import models as open_api_models
-from alibabacloud_tea_util import models as util_models
+from Tea.exceptions import TeaException, UnretryableException
+import aiohttp
+import requests
 from pydantic import Field
 import json
 import time
@@ -28,6 +39,7 @@ from models import (
     ExecutionLog,
     enable_execution_log_ctx,
 )
+from sdk_defaults import DEFAULT_RUNTIME, EMPTY_HEADERS
 from ack_cluster_helpers import (
     filter_nodepool,
     filter_node,
@@ -38,49 +50,181 @@ from ack_cluster_helpers import (
 )
 
 
-def _serialize_sdk_object(obj):
-    """序列化阿里云 SDK 对象为可 JSON 的字典。"""
-    if obj is None:
-        return None
-    if isinstance(obj, (str, int, float, bool)):
-        return obj
-    if isinstance(obj, (list, tuple)):
-        return [_serialize_sdk_object(i) for i in obj]
-    if isinstance(obj, dict):
-        return {k: _serialize_sdk_object(v) for k, v in obj.items()}
+_PRIMITIVE_TYPES = (str, int, float, bool)
+_EXACT_PRIMITIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+# 兜底：纯 list/dict 循环引用时不会无限展开，超过该深度的节点退化为 str()
+_MAX_SERIALIZE_DEPTH = 10000
+# 出栈标记：对象的 __dict__ 展开完成后将其移出祖先集合
+_EXIT = object()
+
+
+# 非内置类型的转换函数按类型缓存（类型 -> 转换函数的分派表），同一 SDK 模型类只做一次探测
+def _convert_to_map(value: Any) -> Any:
+    return value.to_map()
+
+
+def _convert_isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+def _convert_decode(value: Any) -> str:
+    return bytes(value).decode("utf-8", "replace")
+
+
+# __dict__ 需要入栈继续展开，不能直接转换，用哨兵标记
+_CONVERT_DICT = object()
+_CONVERTER_CACHE: Dict[type, Any] = {}
+
+
+def _resolve_converter(value: Any) -> Any:
+    """探测对象的转换函数：datetime/date、Decimal、bytes 转为 JSON 原生类型；其余优先 to_map()，其次 __dict__，否则 str()。
+
+    to_map 在类型上查找，不触发实例级的 __getattr__。
+    """
+    if isinstance(value, (datetime, date)):
+        return _convert_isoformat
+    if isinstance(value, Decimal):
+        return float
+    if isinstance(value, (bytes, bytearray)):
+        return _convert_decode
+    if callable(getattr(type(value), "to_map", None)):
+        return _convert_to_map
     try:
-        if hasattr(obj, "to_map"):
-            return obj.to_map()
-        if hasattr(obj, "__dict__"):
-            return _serialize_sdk_object(obj.__dict__)
+        if hasattr(value, "__dict__"):
+            return _CONVERT_DICT
     except Exception:
         pass
-    return str(obj)
+    return str
+
+
+def _serialize_sdk_object(obj: Any) -> Any:
+    """序列化阿里云 SDK 对象为可 JSON 的字典。
 
+    使用显式栈迭代展开 list/tuple/dict 与 __dict__，避免逐层递归调用；容器中的基础类型子元素
+    按精确类型直接保留，不再入栈。to_map() 的结果已是纯数据，直接使用；datetime、Decimal、bytes
+    转为 isoformat 字符串、float、UTF-8 字符串，保证输出只含 JSON 原生类型。
+    对象经 __dict__ 出现循环引用时，该节点退化为 str()。
+    """
+    primitives = _EXACT_PRIMITIVE_TYPES
+    if type(obj) in primitives:
+        return obj
+    # 顶层即为 SDK 模型（response.body 的常见情况）：直接返回 to_map() 结果，不进入栈循环
+    if _CONVERTER_CACHE.get(type(obj)) is _convert_to_map:
+        try:
+            return obj.to_map()
+        except Exception:
+            return str(obj)
+    root = [None]
+    stack: List[tuple] = [(root, 0, obj, 0)]
+    pop, push = stack.pop, stack.append
+    active: set = set()
+    while stack:
+        parent, key, value, depth = pop()
+        if parent is _EXIT:
+            active.discard(key)
+            continue
+        t = type(value)
+        if t is dict or (t not in primitives and isinstance(value, dict)):
+            if depth >= _MAX_SERIALIZE_DEPTH:
+                parent[key] = str(value)
+                continue
+            out_map = dict(value)
+            parent[key] = out_map
+            depth += 1
+            for k, v in out_map.items():
+                if type(v) not in primitives:
+                    push((out_map, k, v, depth))
+        elif t is list or t is tuple or (t not in primitives and isinstance(value, (list, tuple))):
+            if depth >= _MAX_SERIALIZE_DEPTH:
+                parent[key] = str(value)
+                continue
+            out_seq = list(value)
+            parent[key] = out_seq
+            depth += 1
+            for i, v in enumerate(out_seq):
+                if type(v) not in primitives:
+                    push((out_seq, i, v, depth))
+        elif t in primitives or isinstance(value, _PRIMITIVE_TYPES):
+            parent[key] = value
+        elif id(value) in active:
+            parent[key] = str(value)
+        else:
+            conv = _CONVERTER_CACHE.get(t)
+            if conv is None:
+                conv = _CONVERTER_CACHE[t] = _resolve_converter(value)
+            if conv is _CONVERT_DICT:
+                active.add(id(value))
+                push((_EXIT, id(value), None, depth))
+                push((parent, key, value.__dict__, depth))
+                continue
+            try:
+                parent[key] = conv(value)
+            except Exception:
+                parent[key] = str(value)
+    return root[0]
 
-def _get_cs_client(ctx: Context, region: str):
+
+def _get_cs_client(ctx: Context, region: str) -> CS20151215Client:
     """从 lifespan providers 中获取指定区域的 CS 客户端。"""
-    lifespan_context = getattr(ctx.request_context, "lifespan_context", {}) or {}
-    providers = lifespan_context.get("providers", {}) if isinstance(lifespan_context, dict) else {}
-    config = lifespan_context.get("config", {}) if isinstance(lifespan_context, dict) else {}
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    if not isinstance(lifespan_context, dict):
+        lifespan_context = {}
+    providers = lifespan_context.get("providers")
     cs_client_factory = providers.get("cs_client_factory") if isinstance(providers, dict) else None
     if not cs_client_factory:
         raise RuntimeError("cs_client_factory not available in runtime providers")
-    return cs_client_factory(region, config)
+    return cs_client_factory(region, lifespan_context.get("config", {}))
 
 
-async def _get_cluster_region(ctx: Context, cluster_id: str) -> str:
-    """通过 DescribeClusterDetail 获取集群的 region_id。"""
+def _credential_scope(ctx: Context) -> Tuple[str, str]:
+    """返回当前调用凭证的缓存作用域 (access_key_id, secret 的 sha256)，不同凭证的调用方不共享缓存结果。"""
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    config = lifespan_context.get("config") if isinstance(lifespan_context, dict) else None
+    if not isinstance(config, dict):
+        config = {}
+    secret = config.get("access_key_secret") or ""
+    return config.get("access_key_id") or "", hashlib.sha256(secret.encode()).hexdigest()
+
+
+# 集群所在 region 创建后不会变化，缓存 DescribeClusterDetail 的解析结果，避免每次工具调用多一次 CENTER 往返
+_CLUSTER_REGION_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+# 缓存未命中时，同一集群的并发查询合并为一次 DescribeClusterDetail
+_CLUSTER_REGION_INFLIGHT: Dict[str, "asyncio.Future[str]"] = {}
+
+
+async def _describe_cluster_region(ctx: Context, cluster_id: str) -> str:
+    """调用 DescribeClusterDetail 解析集群 region_id，并写入缓存。"""
     cs_client = _get_cs_client(ctx, "CENTER")
-    detail_response = await cs_client.describe_cluster_detail_async(cluster_id)
+    async with _cs_call_slot():
+        detail_response = await cs_client.describe_cluster_detail_async(cluster_id)
     if not detail_response or not detail_response.body:
         raise ValueError(f"Failed to get cluster details for {cluster_id}")
     region = getattr(detail_response.body, "region_id", "") or ""
     if not region:
         raise ValueError(f"Could not determine region for cluster {cluster_id}")
+    _CLUSTER_REGION_CACHE[cluster_id] = region
     return region
 
 
+async def _get_cluster_region(ctx: Context, cluster_id: str) -> str:
+    """通过 DescribeClusterDetail 获取集群的 region_id（按 cluster_id 缓存，并发请求合并）。"""
+    region = _CLUSTER_REGION_CACHE.get(cluster_id)
+    if region:
+        return region
+    pending = _CLUSTER_REGION_INFLIGHT.get(cluster_id)
+    if pending is None:
+        pending = asyncio.ensure_future(_describe_cluster_region(ctx, cluster_id))
+        _CLUSTER_REGION_INFLIGHT[cluster_id] = pending
+        pending.add_done_callback(lambda _f: _CLUSTER_REGION_INFLIGHT.pop(cluster_id, None))
+    # shield：某个调用方被取消时不影响共享同一查询的其他调用方
+    return await asyncio.shield(pending)
+
+
+async def _get_regional_cs_client(ctx: Context, cluster_id: str) -> CS20151215Client:
+    """解析集群所在 region，并返回该 region 的 CS 客户端。"""
+    return _get_cs_client(ctx, await _get_cluster_region(ctx, cluster_id))
+
+
 class ClusterNodeState(Enum):
     ALL = "all"
     RUNNING = "running"
@@ -142,30 +286,215 @@ _CLUSTER_NODE_STATE_DESC = f"集群节点状态，按照集群节点运行状态
 _CLUSTER_TASK_STATE_DESC = f"任务状态筛选，取值：{",".join(str(i.value) for i in list(ClusterTaskState))}"
 
 
+# 节点池列表不带过滤条件查询；SDK 只做 validate 和读取 query 字段，不会修改请求对象，可复用同一实例
+_EMPTY_NODEPOOLS_REQUEST = cs20151215_models.DescribeClusterNodePoolsRequest()
+
+
+def _start_execution_log(tool_name: str) -> tuple[ExecutionLog, float]:
+    """创建工具调用的 ExecutionLog，返回 (execution_log, start_ms)。"""
+    now = datetime.now(timezone.utc)
+    start_ms = now.timestamp() * 1000
+    return ExecutionLog(tool_call_id=f"{tool_name}_{start_ms}", start_time=now.isoformat()), start_ms
+
+
+def _finish_execution_log(execution_log: ExecutionLog, start_ms: float) -> None:
+    """记录 ExecutionLog 的结束时间与耗时。"""
+    now = datetime.now(timezone.utc)
+    execution_log.end_time = now.isoformat()
+    execution_log.duration_ms = int(now.timestamp() * 1000 - start_ms)
+
+
 def _cs_runtime_headers() -> tuple:
     """CS 请求通用的 runtime 与 headers。"""
-    return util_models.RuntimeOptions(), {}
+    return DEFAULT_RUNTIME, EMPTY_HEADERS
+
+
+# 只读 CS 接口遇到限流、5xx 或网络错误时的重试次数（含首次调用）与退避基数（秒）
+_READ_RETRY_ATTEMPTS = 3
+_READ_RETRY_BASE_DELAY = 0.25
+
+
+# SDK 未拿到响应时包在 UnretryableException 里的网络/超时错误；其他内部异常（如 TypeError）属于程序错误，不重试
+_TRANSIENT_NETWORK_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    aiohttp.ClientConnectionError,
+)
+
+
+def _sdk_error_status(e: TeaException) -> Optional[int]:
+    """取 SDK 异常对应的 HTTP 状态码；响应体为空时 statusCode 不会写入 data，依次回退到 status_code 与 data 中的 httpCode。"""
+    data = e.data if isinstance(e.data, dict) else {}
+    candidates: tuple[Any, ...] = (
+        getattr(e, "statusCode", None),
+        getattr(e, "status_code", None),
+        data.get("httpCode"),
+        data.get("statusCode"),
+    )
+    for status in candidates:
+        try:
+            return int(status)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _is_transient_sdk_error(e: Exception) -> bool:
+    """判断 SDK 异常是否可重试：限流、服务端 5xx，或未拿到响应的网络/超时错误。"""
+    if isinstance(e, UnretryableException):
+        inner = getattr(e, "inner_exception", None)
+        if not isinstance(inner, TeaException):
+            return isinstance(inner, _TRANSIENT_NETWORK_ERRORS)
+        e = inner
+    if not isinstance(e, TeaException):
+        return False
+    status = _sdk_error_status(e)
+    if status is not None and status >= 500:
+        return True
+    return "throttling" in str(e.code or "").lower()
+
+
+# 当前工具调用所属 handler 的 CS 并发上限；未设置时不限流
+cs_inflight_limit_ctx: contextvars.ContextVar[Optional[asyncio.Semaphore]] = contextvars.ContextVar(
+    "cs_inflight_limit", default=None
+)
+_NO_INFLIGHT_LIMIT = contextlib.nullcontext()
+
+
+def _cs_call_slot() -> contextlib.AbstractAsyncContextManager[Any]:
+    """返回 CS 调用的并发槽位（async with 使用）；handler 未配置上限时为空上下文。"""
+    return cs_inflight_limit_ctx.get() or _NO_INFLIGHT_LIMIT
+
+
+async def _with_read_retry(call: Callable[[], Awaitable[Any]]) -> Any:
+    """执行只读 SDK 调用，瞬时错误按指数退避加随机抖动重试；其他错误直接抛出。不要用于写操作。
+
+    每次调用占用一个 CS 并发槽位，退避等待期间不占用。
+    """
+    for attempt in range(_READ_RETRY_ATTEMPTS):
+        try:
+            async with _cs_call_slot():
+                return await call()
+        except Exception as e:
+            if attempt >= _READ_RETRY_ATTEMPTS - 1 or not _is_transient_sdk_error(e):
+                raise
+            delay = _READ_RETRY_BASE_DELAY * (2 ** attempt) + random.random() * 0.1
+            logger.warning(
+                "Transient CS API error, retry {}/{} in {:.2f}s: {}", attempt + 1, _READ_RETRY_ATTEMPTS - 1, delay, e
+            )
+            await asyncio.sleep(delay)
+
+
+# 列表类响应条目数超过该阈值时在线程中序列化；条目较少时线程切换开销大于序列化本身
+_SERIALIZE_OFFLOAD_THRESHOLD = 200
+
+
+async def _serialize_items(serialize: Any, items: Any) -> Any:
+    """序列化 SDK 列表字段；条目较多时放到线程中执行，避免阻塞事件循环上的其他工具调用。"""
+    if isinstance(items, (list, tuple)) and len(items) > _SERIALIZE_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(serialize, items)
+    return serialize(items)
+
+
+# list_cluster_nodepools 单次 nodepool_ids 的数量上限，以及并发查询节点池详情的并发数
+_NODEPOOL_IDS_BATCH_LIMIT = 50
+_NODEPOOL_DETAIL_CONCURRENCY = 16
 
 
 async def _fetch_nodepool_detail(
-    client: Any, cluster_id: str, nodepool_id: str, serialize: Any
+    client: Any,
+    cluster_id: str,
+    nodepool_id: str,
+    serialize: Any,
+    cache: Optional[TTLCache] = None,
+    cache_scope: Tuple[str, ...] = (),
 ) -> List[Dict[str, Any]]:
-    """调用 DescribeClusterNodePoolDetail，返回单条详情列表（0 或 1 项）。"""
+    """调用 DescribeClusterNodePoolDetail，返回单条详情列表（0 或 1 项）。
+
+    传入 cache 时按 (*cache_scope, cluster_id, nodepool_id) 短时缓存；cache_scope 应包含凭证与 region，
+    避免不同凭证的调用方拿到彼此的节点池详情。
+    """
+    key = (*cache_scope, cluster_id, nodepool_id)
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        return [copy.deepcopy(cached)]
     runtime, headers = _cs_runtime_headers()
-    response = await client.describe_cluster_node_pool_detail_with_options_async(
-        cluster_id, nodepool_id, headers, runtime
+    response = await _with_read_retry(
+        lambda: client.describe_cluster_node_pool_detail_with_options_async(cluster_id, nodepool_id, headers, runtime)
     )
-    detail = serialize(response.body) if response.body else {}
-    return [detail] if detail else []
+    body = getattr(response, "body", None)
+    detail = serialize(body) if body else {}
+    if not detail:
+        return []
+    if cache is None:
+        return [detail]
+    cache[key] = detail
+    return [copy.deepcopy(detail)]
+
 
+async def _fetch_nodepool_details(
+    client: Any,
+    cluster_id: str,
+    nodepool_ids: List[str],
+    serialize: Any,
+    concurrency: int = _NODEPOOL_DETAIL_CONCURRENCY,
+    cache: Optional[TTLCache] = None,
+    cache_scope: Tuple[str, ...] = (),
+) -> List[Dict[str, Any]]:
+    """并发调用 DescribeClusterNodePoolDetail，按 nodepool_ids 顺序返回详情；用信号量限制并发数。
 
-async def _fetch_nodepools_list(client: Any, cluster_id: str, serialize: Any) -> List[Dict[str, Any]]:
-    """调用 DescribeClusterNodePools，返回节点池列表（未分页、未过滤字段）。"""
+    使用 TaskGroup：任一节点池查询失败时立即取消其余未完成的查询，不再白白消耗 CS 接口配额。
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(nodepool_id: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await _fetch_nodepool_detail(client, cluster_id, nodepool_id, serialize, cache, cache_scope)
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(_one(nid)) for nid in dict.fromkeys(nodepool_ids)]
+    except* Exception as eg:
+        # 与单个查询的失败保持一致：向上抛出首个原始异常，而不是 ExceptionGroup
+        raise eg.exceptions[0] from None
+    return [detail for task in tasks for detail in task.result()]
+
+
+async def _fetch_nodepools_list(
+    client: Any, cluster_id: str, serialize: Any, start: int = 0, limit: Optional[int] = None
+) -> tuple[List[Dict[str, Any]], int]:
+    """调用 DescribeClusterNodePools，返回 ([start, start+limit) 范围内的节点池, 节点池总数)。
+
+    接口本身不分页，先在 SDK 对象上切片，只序列化当前页，避免序列化后再丢弃其余节点池。
+    """
     runtime, headers = _cs_runtime_headers()
-    request = cs20151215_models.DescribeClusterNodePoolsRequest()
-    response = await client.describe_cluster_node_pools_with_options_async(cluster_id, request, headers, runtime)
-    raw = serialize(response.body.nodepools) if (response.body and response.body.nodepools) else []
-    return raw if isinstance(raw, list) else []
+    request = _EMPTY_NODEPOOLS_REQUEST
+    response = await _with_read_retry(
+        lambda: client.describe_cluster_node_pools_with_options_async(cluster_id, request, headers, runtime)
+    )
+    body = getattr(response, "body", None)
+    nodepools = getattr(body, "nodepools", None) if body else None
+    if not nodepools:
+        return [], 0
+    end = None if limit is None else start + limit
+    if isinstance(nodepools, (list, tuple)):
+        raw = await _serialize_items(serialize, nodepools[start:end])
+        return (raw if isinstance(raw, list) else []), len(nodepools)
+    raw = serialize(nodepools)
+    raw = raw if isinstance(raw, list) else []
+    return raw[start:end], len(raw)
+
+
+def _node_field_in(key: str, alt_key: str, allowed: set) -> Callable[[Dict[str, Any]], bool]:
+    """返回节点过滤条件：节点的 key（或 alt_key）字段取值在 allowed 中。"""
+
+    def _pred(n: Dict[str, Any]) -> bool:
+        v = n.get(key) or n.get(alt_key)
+        return v is not None and str(v) in allowed
+
+    return _pred
 
 
 async def _fetch_nodes_page(
@@ -187,25 +516,53 @@ async def _fetch_nodes_page(
         "page_size": page_size,
         "nodepool_id": nodepool_id,
     }
-    if state:
+    if state is not None:
         req_kw["state"] = state.value
     if instance_ids:
         # API 接受逗号分隔；部分 SDK 需字符串，部分接受 list
         req_kw["instance_ids"] = ",".join(str(i) for i in instance_ids)
     request = cs20151215_models.DescribeClusterNodesRequest(**req_kw)
-    response = await client.describe_cluster_nodes_with_options_async(cluster_id, request, headers, runtime)
-    nodes = serialize(response.body.nodes) if (response.body and response.body.nodes) else []
+    response = await _with_read_retry(
+        lambda: client.describe_cluster_nodes_with_options_async(cluster_id, request, headers, runtime)
+    )
+    body = getattr(response, "body", None)
+    raw_nodes = getattr(body, "nodes", None) if body else None
+    nodes = await _serialize_items(serialize, raw_nodes) if raw_nodes else []
     nodes = nodes if isinstance(nodes, list) else []
+    # instance_ids 也交给了服务端过滤，客户端仍按同样条件兜底；所有条件在同一次遍历中判断
+    predicates: List[Callable[[Dict[str, Any]], bool]] = []
     if instance_ids:
-        ids = {str(i) for i in instance_ids}
-        nodes = [n for n in nodes if (v := (n.get("instance_id") or n.get("instanceId"))) is not None and str(v) in ids]
+        predicates.append(_node_field_in("instance_id", "instanceId", {str(i) for i in instance_ids}))
     if node_names:
-        names = {str(i) for i in node_names}
-        nodes = [n for n in nodes if (v := (n.get("node_name") or n.get("nodeName"))) is not None and str(v) in names]
-    page_info = extract_page_info(response.body, serialize)
+        predicates.append(_node_field_in("node_name", "nodeName", {str(i) for i in node_names}))
+    if predicates:
+        nodes = [n for n in nodes if all(pred(n) for pred in predicates)]
+    page_info = extract_page_info(body, serialize)
     return nodes, page_info
 
 
+# DescribeClusterTasks 的 call_api Params 只随 cluster_id 变化；call_api 只读取 Params 字段，按集群复用同一实例
+_DESCRIBE_TASKS_PARAMS_CACHE: LRUCache = LRUCache(maxsize=256)
+
+
+def _describe_tasks_params(cluster_id: str) -> open_api_models.Params:
+    """返回指定集群 DescribeClusterTasks 的 call_api Params（按 cluster_id 缓存）。"""
+    params = _DESCRIBE_TASKS_PARAMS_CACHE.get(cluster_id)
+    if params is None:
+        params = _DESCRIBE_TASKS_PARAMS_CACHE[cluster_id] = open_api_models.Params(
+            action="DescribeClusterTasks",
+            version="2015-12-15",
+            protocol="HTTPS",
+            method="GET",
+            auth_type="AK",
+            style="ROA",
+            pathname=f"/clusters/{cluster_id}/tasks",
+            req_body_type="json",
+            body_type="json",
+        )
+    return params
+
+
 async def _fetch_tasks_page(
     client: Any,
     cluster_id: str,
@@ -224,30 +581,22 @@ async def _fetch_tasks_page(
         "page_size": str(page_size),
         "detail": "true",
     }
-    if state:
-        query["state"] = state.value
-    if task_type:
-        query["type"] = task_type.value
-    if target_id:
-        query["target_id"] = target_id
-
-    params = open_api_models.Params(
-        action="DescribeClusterTasks",
-        version="2015-12-15",
-        protocol="HTTPS",
-        method="GET",
-        auth_type="AK",
-        style="ROA",
-        pathname=f"/clusters/{cluster_id}/tasks",
-        req_body_type="json",
-        body_type="json",
-    )
+    for key, val in (
+        ("state", state.value if state is not None else None),
+        ("type", task_type.value if task_type is not None else None),
+        ("target_id", target_id),
+    ):
+        if val is not None:
+            query[key] = val
+
+    params = _describe_tasks_params(cluster_id)
     request = open_api_models.OpenApiRequest(query=query)
-    resp = await client.call_api_async(params, request, runtime)
+    resp = await _with_read_retry(lambda: client.call_api_async(params, request, runtime))
     body = resp.get("body")
     body = body if isinstance(body, dict) else {}
     raw = body.get("tasks") or body.get("Tasks") or []
-    tasks = serialize(raw) if raw else []
+    # call_api 返回的已是 json 解析后的纯数据，无需再经 serialize 遍历；浅拷贝一份供调用方拼接多页
+    tasks = list(raw) if isinstance(raw, list) else []
     return tasks, extract_page_info(body, serialize)
 
 
@@ -285,10 +634,11 @@ async def _map_instance_id_to_node_name(
                 if node_instance_id and str(node_instance_id) == str(instance_id):
                     node_name = node.get("node_name")
                     if node_name:
-                        logger.debug(f"Mapped instance_id {instance_id} to node_name {node_name}")
+                        logger.debug("Mapped instance_id {} to node_name {}", instance_id, node_name)
                         return node_name
-    except Exception as e:
-        logger.warning(f"Failed to map instance_id {instance_id} to node_name: {e}")
+    except (TeaException, TypeError, ValueError) as e:
+        # 仅吞掉 SDK 调用失败（UnretryableException 也是 TeaException）与数据解析错误，映射失败时退化为只按 instance_id 过滤
+        logger.warning("Failed to map instance_id {} to node_name: {}", instance_id, e)
     return None
 
 
@@ -303,7 +653,7 @@ def parse_master_url(master_url: str) -> dict:
             out["api_server_endpoint"] = d.get("api_server_endpoint") or ""
             out["intranet_api_server_endpoint"] = d.get("intranet_api_server_endpoint") or ""
     except json.JSONDecodeError as e:
-        logger.debug(f"parse_master_url JSON error: {e}")
+        logger.debug("parse_master_url JSON error: {}", e)
     return out
 
 
@@ -314,8 +664,8 @@ def _parse_cluster_info(d: Dict[str, Any]) -> Optional[ClusterInfo]:
         cid = d.get("cluster_id") or d.get("clusterId") or ""
         state = d.get("state") or d.get("cluster_state") or d.get("status") or ""
         ctype = d.get("cluster_type") or d.get("clusterType") or ""
-        if not all((name, cid, state, ctype)):
-            logger.warning(f"Skipping cluster with missing required fields: {d}")
+        if not (name and cid and state and ctype):
+            logger.warning("Skipping cluster with missing required fields: {}", d)
             return None
         return ClusterInfo(
             cluster_name=name,
@@ -334,8 +684,9 @@ def _parse_cluster_info(d: Dict[str, Any]) -> Optional[ClusterInfo]:
             service_cidr=d.get("service_cidr"),
             api_server_endpoints=parse_master_url(d.get("master_url", "")),
         )
-    except Exception as e:
-        logger.warning(f"Failed to parse cluster data: {e}")
+    except (AttributeError, TypeError, ValueError) as e:
+        # 单条数据结构异常或 ClusterInfo 校验失败（pydantic ValidationError 属于 ValueError）时跳过该条
+        logger.warning("Failed to parse cluster data: {}", e)
         return None
 
 
@@ -363,6 +714,16 @@ class ACKClusterHandler:
         # Per-handler toggle
         self.enable_execution_log = self.settings.get("enable_execution_log", False)
 
+        # 同时在途的 CS API 请求上限，避免批量调用时打满连接与服务端限流
+        self.cs_semaphore = asyncio.Semaphore(max(1, int(self.settings.get("max_inflight_cs_requests", 16))))
+
+        # 节点池详情短时缓存（秒级 TTL，可通过 detail_cache_ttl 配置，0 表示不缓存）；
+        # 键包含凭证与 region，节点池变更后需调用 invalidate_nodepool_detail 失效
+        detail_cache_ttl = float(self.settings.get("detail_cache_ttl", 5))
+        self._detail_cache: Optional[TTLCache] = (
+            TTLCache(maxsize=256, ttl=detail_cache_ttl) if detail_cache_ttl > 0 else None
+        )
+
         if server is None:
             return
         self.server = server
@@ -384,6 +745,14 @@ class ACKClusterHandler:
 
         logger.info("ACK Addon Management Handler initialized")
 
+    def invalidate_nodepool_detail(self, cluster_id: str, nodepool_id: Optional[str] = None) -> None:
+        """失效节点池详情缓存；不传 nodepool_id 时失效该集群下所有节点池。节点池变更类操作完成后调用。"""
+        if self._detail_cache is None:
+            return
+        for key in list(self._detail_cache.keys()):
+            if key[-2] == cluster_id and nodepool_id in (None, key[-1]):
+                self._detail_cache.pop(key, None)
+
     async def list_clusters(
         self,
         ctx: Context,
@@ -407,12 +776,8 @@ class ACKClusterHandler:
 
         # Initialize execution log
         enable_execution_log_ctx.set(self.enable_execution_log)
-        now = datetime.now(timezone.utc)
-        start_ms = now.timestamp() * 1000
-        execution_log = ExecutionLog(
-            tool_call_id=f"list_clusters_{start_ms}",
-            start_time=now.isoformat(),
-        )
+        cs_inflight_limit_ctx.set(self.cs_semaphore)
+        execution_log, start_ms = _start_execution_log("list_clusters")
 
         try:
             cs_client = _get_cs_client(ctx, "CENTER")
@@ -425,14 +790,15 @@ class ACKClusterHandler:
                 page_size=actual_page_size,
                 page_number=actual_page_num,
             )
-            runtime, headers = util_models.RuntimeOptions(), {}
+            runtime, headers = _cs_runtime_headers()
 
             # 调用 API
             api_start = int(time.time() * 1000)
             execution_log.messages.append("Calling DescribeClusters API")
 
             try:
-                response = await cs_client.describe_clusters_v1with_options_async(request, headers, runtime)
+                async with _cs_call_slot():
+                    response = await cs_client.describe_clusters_v1with_options_async(request, headers, runtime)
                 api_duration = int(time.time() * 1000) - api_start
 
                 execution_log.api_calls.append(
@@ -467,9 +833,9 @@ class ACKClusterHandler:
                 else "N/A"
             )
             execution_log.messages.append(f"Processing API response, requestId: {request_id}")
-            clusters_data = (
-                _serialize_sdk_object(response.body.clusters) if response.body and response.body.clusters else []
-            )
+            body = getattr(response, "body", None)
+            raw_clusters = getattr(body, "clusters", None) if body else None
+            clusters_data = await _serialize_items(_serialize_sdk_object, raw_clusters) if raw_clusters else []
             execution_log.messages.append(f"Retrieved {len(clusters_data)} raw cluster records")
 
             clusters = []
@@ -486,16 +852,14 @@ class ACKClusterHandler:
             if skipped_count > 0:
                 execution_log.warnings.append(f"Skipped {skipped_count} clusters with missing required fields")
 
-            execution_log.messages.append(f"Successfully list {len(clusters)} clusters")
-            now = datetime.now(timezone.utc)
-            end_ms = now.timestamp() * 1000
-            execution_log.end_time = now.isoformat()
-            execution_log.duration_ms = int(end_ms - start_ms)
+            count = len(clusters)
+            execution_log.messages.append(f"Successfully list {count} clusters")
+            _finish_execution_log(execution_log, start_ms)
 
-            return ListClustersOutput(count=len(clusters), clusters=clusters, execution_log=execution_log)
+            return ListClustersOutput(count=count, clusters=clusters, execution_log=execution_log)
 
         except Exception as e:
-            logger.error(f"Failed to list clusters: {e}")
+            logger.error("Failed to list clusters: {}", e)
             error_message = str(e)
             error_code = ClusterErrorCodes.NO_RAM_POLICY_AUTH
 
@@ -505,10 +869,7 @@ class ACKClusterHandler:
 
             execution_log.error = error_message
             execution_log.messages.append(f"Operation failed: {error_message}")
-            now = datetime.now(timezone.utc)
-            end_ms = now.timestamp() * 1000
-            execution_log.end_time = now.isoformat()
-            execution_log.duration_ms = int(end_ms - start_ms)
+            _finish_execution_log(execution_log, start_ms)
             execution_log.metadata = {"error_code": error_code, "failure_stage": "list_clusters_operation"}
 
             return ListClustersOutput(
@@ -531,10 +892,15 @@ class ACKClusterHandler:
         page_size: Annotated[
             int, Field(description="查询集群内节点池分页参数，默认10；仅在不指定 nodepool_id 时生效")
         ] = 10,
+        nodepool_ids: Annotated[
+            Optional[List[str]],
+            Field(description="节点池ID列表，可选；并发查询这些节点池的详情，与 nodepool_id 参数互斥"),
+        ] = None,
     ) -> ListClusterNodepoolsOutput:
         """
-        Query cluster node pools: uses DescribeClusterNodePoolDetail when nodepool_id is specified;
-        otherwise uses DescribeClusterNodePools with pagination.
+        Query cluster node pools: uses DescribeClusterNodePoolDetail when nodepool_id is specified
+        (concurrently for each id when nodepool_ids is specified); otherwise uses DescribeClusterNodePools
+        with pagination.
 
         Args:
             ctx: FastMCP context containing lifespan providers
@@ -542,6 +908,7 @@ class ACKClusterHandler:
             nodepool_id: Optional, returns only this specific node pool
             page_number: Page number for pagination, default is 1
             page_size: Number of results per page, default is 10, maximum 100
+            nodepool_ids: Optional, returns details of these node pools (at most 50; mutually exclusive with nodepool_id)
 
         Returns:
             ListClusterNodepoolsOutput: Contains node pool list and execution log
@@ -551,39 +918,74 @@ class ACKClusterHandler:
         """
 
         enable_execution_log_ctx.set(self.enable_execution_log)
-        now = datetime.now(timezone.utc)
-        start_ms = now.timestamp() * 1000
-        execution_log = ExecutionLog(
-            tool_call_id=f"list_cluster_nodepools_{start_ms}",
-            start_time=now.isoformat(),
-        )
+        cs_inflight_limit_ctx.set(self.cs_semaphore)
+        execution_log, start_ms = _start_execution_log("list_cluster_nodepools")
+        if nodepool_id and nodepool_ids:
+            error_message = "nodepool_id 与 nodepool_ids 参数互斥，只能指定其中一个"
+        elif nodepool_ids and len(nodepool_ids) > _NODEPOOL_IDS_BATCH_LIMIT:
+            error_message = f"nodepool_ids 数量 {len(nodepool_ids)} 超过上限 {_NODEPOOL_IDS_BATCH_LIMIT}"
+        else:
+            error_message = None
+        if error_message:
+            execution_log.messages.append(f"Invalid parameters: {error_message}")
+            _finish_execution_log(execution_log, start_ms)
+            execution_log.error = error_message
+            return ListClusterNodepoolsOutput(
+                count=0,
+                error=ErrorModel(error_code=ClusterErrorCodes.INVALID_NODEPOOL_IDS, error_message=error_message),
+                execution_log=execution_log,
+            )
+
         try:
-            region_id = await _get_cluster_region(ctx, cluster_id)
-            cs = _get_cs_client(ctx, region_id)
+            region = await _get_cluster_region(ctx, cluster_id)
+            cs = _get_cs_client(ctx, region)
+            cache_scope = (*_credential_scope(ctx), region)
 
             if nodepool_id:
-                raw = await _fetch_nodepool_detail(cs, cluster_id, nodepool_id, _serialize_sdk_object)
+                raw = await _fetch_nodepool_detail(
+                    cs, cluster_id, nodepool_id, _serialize_sdk_object, self._detail_cache, cache_scope
+                )
                 items = [filter_nodepool(x) for x in raw]
+                count = len(items)
                 return ListClusterNodepoolsOutput(
-                    count=len(items), total_count=len(items), nodepools=items, page_number=1, page_size=1
+                    count=count, total_count=count, nodepools=items, page_number=1, page_size=1
+                )
+
+            if nodepool_ids:
+                raw = await _fetch_nodepool_details(
+                    cs,
+                    cluster_id,
+                    nodepool_ids,
+                    _serialize_sdk_object,
+                    cache=self._detail_cache,
+                    cache_scope=cache_scope,
+                )
+                items = [filter_nodepool(x) for x in raw]
+                count = len(items)
+                execution_log.messages.append(f"Successfully describe {count} nodepools")
+                _finish_execution_log(execution_log, start_ms)
+                return ListClusterNodepoolsOutput(
+                    count=count,
+                    total_count=count,
+                    nodepools=items,
+                    page_number=1,
+                    page_size=count,
+                    execution_log=execution_log,
                 )
 
-            all_raw = await _fetch_nodepools_list(cs, cluster_id, _serialize_sdk_object)
-            total_count = len(all_raw)
             ps = max(1, int(page_size or 10))
             pn = max(1, int(page_number or 1))
-            start = (pn - 1) * ps
-            page = all_raw[start : start + ps]
+            page, total_count = await _fetch_nodepools_list(
+                cs, cluster_id, _serialize_sdk_object, start=(pn - 1) * ps, limit=ps
+            )
             items = [filter_nodepool(x) for x in page]
 
-            execution_log.messages.append(f"Successfully list {len(items)} nodepools")
-            now = datetime.now(timezone.utc)
-            end_ms = now.timestamp() * 1000
-            execution_log.end_time = now.isoformat()
-            execution_log.duration_ms = int(end_ms - start_ms)
+            count = len(items)
+            execution_log.messages.append(f"Successfully list {count} nodepools")
+            _finish_execution_log(execution_log, start_ms)
 
             return ListClusterNodepoolsOutput(
-                count=len(items),
+                count=count,
                 total_count=total_count,
                 nodepools=items,
                 page_number=pn,
@@ -591,12 +993,9 @@ class ACKClusterHandler:
                 execution_log=execution_log,
             )
         except Exception as e:
-            logger.error(f"Failed to list cluster nodepools: {e}")
+            logger.error("Failed to list cluster nodepools: {}", e)
             execution_log.messages.append(f"Failed list cluster nodepools, error: {e}")
-            now = datetime.now(timezone.utc)
-            end_ms = now.timestamp() * 1000
-            execution_log.end_time = now.isoformat()
-            execution_log.duration_ms = int(end_ms - start_ms)
+            _finish_execution_log(execution_log, start_ms)
             execution_log.error = str(e)
             return ListClusterNodepoolsOutput(
                 count=0,
@@ -645,15 +1044,10 @@ class ACKClusterHandler:
         """
 
         enable_execution_log_ctx.set(self.enable_execution_log)
-        now = datetime.now(timezone.utc)
-        start_ms = now.timestamp() * 1000
-        execution_log = ExecutionLog(
-            tool_call_id=f"list_cluster_nodes_{start_ms}",
-            start_time=now.isoformat(),
-        )
+        cs_inflight_limit_ctx.set(self.cs_semaphore)
+        execution_log, start_ms = _start_execution_log("list_cluster_nodes")
         try:
-            region_id = await _get_cluster_region(ctx, cluster_id)
-            cs = _get_cs_client(ctx, region_id)
+            cs = await _get_regional_cs_client(ctx, cluster_id)
 
             nodes, page_info = await _fetch_nodes_page(
                 cs,
@@ -668,16 +1062,14 @@ class ACKClusterHandler:
             )
             items = [filter_node(n) for n in nodes]
             pi = page_info or {}
-            total = pi.get("total_count") or pi.get("total") or len(items)
+            count = len(items)
+            total = pi.get("total_count") or pi.get("total") or count
 
-            execution_log.messages.append(f"Successfully list {len(items)} nodes")
-            now = datetime.now(timezone.utc)
-            end_ms = now.timestamp() * 1000
-            execution_log.end_time = now.isoformat()
-            execution_log.duration_ms = int(end_ms - start_ms)
+            execution_log.messages.append(f"Successfully list {count} nodes")
+            _finish_execution_log(execution_log, start_ms)
 
             return ListClusterNodesOutput(
-                count=len(items),
+                count=count,
                 total_count=total if isinstance(total, int) else None,
                 nodes=items,
                 page_number=page_number,
@@ -685,12 +1077,9 @@ class ACKClusterHandler:
                 execution_log=execution_log,
             )
         except Exception as e:
-            logger.error(f"list_cluster_nodes failed: {e}")
+            logger.error("list_cluster_nodes failed: {}", e)
             execution_log.messages.append(f"Failed list cluster nodes: {e}")
-            now = datetime.now(timezone.utc)
-            end_ms = now.timestamp() * 1000
-            execution_log.end_time = now.isoformat()
-            execution_log.duration_ms = int(end_ms - start_ms)
+            _finish_execution_log(execution_log, start_ms)
             execution_log.error = str(e)
             return ListClusterNodesOutput(
                 count=0,
@@ -745,63 +1134,60 @@ class ACKClusterHandler:
         """
 
         enable_execution_log_ctx.set(self.enable_execution_log)
-        now = datetime.now(timezone.utc)
-        start_ms = now.timestamp() * 1000
-        execution_log = ExecutionLog(
-            tool_call_id=f"list_cluster_tasks_{start_ms}",
-            start_time=now.isoformat(),
-        )
+        cs_inflight_limit_ctx.set(self.cs_semaphore)
+        execution_log, start_ms = _start_execution_log("list_cluster_tasks")
         try:
-            region_id = await _get_cluster_region(ctx, cluster_id)
-            cs = _get_cs_client(ctx, region_id)
+            cs = await _get_regional_cs_client(ctx, cluster_id)
             start_sec, end_sec = parse_time_range(start_time, end_time)
-            tasks, page_info = await _fetch_tasks_page(
-                cs,
-                cluster_id,
-                page_number,
-                page_size,
-                _serialize_sdk_object,
-                state=state,
-                task_type=task_type,
-                target_id=nodepool_id,
-            )
             fail_state = (
                 ClusterTaskState.FAIL
                 if state == ClusterTaskState.FAILED
                 else ClusterTaskState.FAILED if state == ClusterTaskState.FAIL else None
             )
-            if fail_state:
-                fail_tasks, fail_page_info = await _fetch_tasks_page(
+            page_fetches = [
+                _fetch_tasks_page(
                     cs,
                     cluster_id,
                     page_number,
                     page_size,
                     _serialize_sdk_object,
-                    state=fail_state,
+                    state=task_state,
                     task_type=task_type,
                     target_id=nodepool_id,
                 )
-                tasks += fail_tasks
-                page_info |= fail_page_info
-
-            # 如果提供了 instance_id，通过 list_cluster_nodes 映射为 node_name
-            node_name = None
-            if instance_id:
-                node_name = await _map_instance_id_to_node_name(cs, cluster_id, instance_id, _serialize_sdk_object)
+                for task_state in ((state, fail_state) if fail_state else (state,))
+            ]
+            # 如果提供了 instance_id，通过 list_cluster_nodes 映射为 node_name；
+            # 与任务查询（含另一种失败状态）互不依赖，作为独立任务并发发起
+            node_name_task = (
+                asyncio.create_task(
+                    _map_instance_id_to_node_name(cs, cluster_id, instance_id, _serialize_sdk_object)
+                )
+                if instance_id
+                else None
+            )
+            try:
+                pages = await asyncio.gather(*page_fetches)
+                node_name = await node_name_task if node_name_task else None
+            finally:
+                if node_name_task and not node_name_task.done():
+                    node_name_task.cancel()
+            tasks, page_info = pages[0]
+            for extra_tasks, extra_page_info in pages[1:]:
+                tasks += extra_tasks
+                page_info |= extra_page_info
 
             collected = [
                 filter_task(t) for t in tasks if task_matches_filters(t, start_sec, end_sec, instance_id, node_name)
             ]
             lp = page_info or {}
 
-            now = datetime.now(timezone.utc)
-            end_ms = now.timestamp() * 1000
-            execution_log.end_time = now.isoformat()
-            execution_log.duration_ms = int(end_ms - start_ms)
+            _finish_execution_log(execution_log, start_ms)
 
             # 如果过滤后没有任务，但 total_count > 0 且从API获取到了任务，
             # 说明任务不匹配过滤条件，返回错误提示
-            if len(collected) == 0 and len(tasks) > 0:
+            count = len(collected)
+            if count == 0 and tasks:
                 execution_log.messages.append("No tasks match the specified filters")
                 return ListClusterTasksOutput(
                     count=0,
@@ -812,10 +1198,10 @@ class ACKClusterHandler:
                     execution_log=execution_log,
                 )
 
-            execution_log.messages.append(f"Successfully list {len(collected)} tasks")
+            execution_log.messages.append(f"Successfully list {count} tasks")
 
             return ListClusterTasksOutput(
-                count=len(collected),
+                count=count,
                 tasks=collected,
                 total_count=lp.get("total_count") if lp.get("total_count") else 0,
                 page_number=lp.get("page_number") or page_number,
@@ -823,12 +1209,9 @@ class ACKClusterHandler:
                 execution_log=execution_log,
             )
         except Exception as e:
-            logger.error(f"list_cluster_tasks failed: {e}")
+            logger.error("list_cluster_tasks failed: {}", e)
             execution_log.messages.append(f"Failed list cluster tasks: {e}")
-            now = datetime.now(timezone.utc)
-            end_ms = now.timestamp() * 1000
-            execution_log.end_time = now.isoformat()
-            execution_log.duration_ms = int(end_ms - start_ms)
+            _finish_execution_log(execution_log, start_ms)
             execution_log.error = str(e)
             return ListClusterTasksOutput(
                 count=0,
@@ -3,31 +3,41 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable, Dict, Optional
 import json
-import re
 
 from loguru import logger
 
+# 节点池输出字段 -> 候选取值路径，按顺序取第一个真值；来源 0=nodepool_info，1=status，2=节点池顶层
+_NODEPOOL_FIELD_PATHS = (
+    ("nodepool_id", ((0, "nodepool_id"), (0, "nodepoolId"), (2, "nodepool_id"), (2, "nodepoolId"))),
+    ("name", ((0, "name"), (2, "name"))),
+    ("type", ((0, "type"), (2, "type"))),
+    ("is_default", ((0, "is_default"), (2, "is_default"))),
+    ("state", ((1, "state"), (2, "state"))),
+    ("total_nodes", ((1, "total_nodes"), (2, "total_nodes"))),
+    ("healthy_nodes", ((1, "healthy_nodes"), (2, "healthy_nodes"))),
+    ("created", ((0, "created"), (2, "created"))),
+    ("updated", ((0, "updated"), (2, "updated"))),
+    ("region_id", ((0, "region_id"), (2, "region_id"))),
+)
+
+
 def filter_nodepool(d: Dict[str, Any]) -> Dict[str, Any]:
     """仅保留节点池白名单字段。从 nodepool_info、status 抽取并扁平化。"""
     if not isinstance(d, dict):
         return {}
     ni = d.get("nodepool_info") or d.get("NodepoolInfo") or {}
     st = d.get("status") or d.get("Status") or {}
-    ni = ni if isinstance(ni, dict) else {}
-    st = st if isinstance(st, dict) else {}
-    out = {
-        "nodepool_id": ni.get("nodepool_id") or ni.get("nodepoolId") or d.get("nodepool_id") or d.get("nodepoolId"),
-        "name": ni.get("name") or d.get("name"),
-        "type": ni.get("type") or d.get("type"),
-        "is_default": ni.get("is_default") or d.get("is_default"),
-        "state": st.get("state") or d.get("state"),
-        "total_nodes": st.get("total_nodes") or d.get("total_nodes"),
-        "healthy_nodes": st.get("healthy_nodes") or d.get("healthy_nodes"),
-        "created": ni.get("created") or d.get("created"),
-        "updated": ni.get("updated") or d.get("updated"),
-        "region_id": ni.get("region_id") or d.get("region_id"),
-    }
-    return {k: v for k, v in out.items() if v is not None}
+    sources = (ni if isinstance(ni, dict) else {}, st if isinstance(st, dict) else {}, d)
+    out = {}
+    for out_k, paths in _NODEPOOL_FIELD_PATHS:
+        v = None
+        for src, k in paths:
+            v = sources[src].get(k)
+            if v:
+                break
+        if v is not None:
+            out[out_k] = v
+    return out
 
 
 def filter_node(d: Dict[str, Any]) -> Dict[str, Any]:
@@ -108,8 +118,8 @@ def parse_task_time(val: Any) -> Optional[int]:
                 dt = dt.replace(tzinfo=timezone.utc)
             # 转换为 UTC 时间戳
             return int(dt.timestamp())
-        except Exception as e:
-            logger.warning(f"parse_task_time error: {e}")
+        except (ValueError, OverflowError, OSError) as e:
+            logger.warning("parse_task_time error: {}", e)
     return None
 
 
@@ -130,9 +140,8 @@ def parse_time_range(
             if end_dt.tzinfo is None:
                 end_dt = end_dt.replace(tzinfo=timezone.utc)
             end_sec = int(end_dt.timestamp())
-        except Exception as e:
-            logger.warning(f"parse_time_range error: {e}")
-            pass
+        except (ValueError, OverflowError, OSError) as e:
+            logger.warning("parse_time_range error: {}", e)
     
     if start_time:
         try:
@@ -153,43 +162,17 @@ def parse_time_range(
                 if start_dt.tzinfo is None:
                     start_dt = start_dt.replace(tzinfo=timezone.utc)
             start_sec = int(start_dt.timestamp())
-        except Exception as e:
-            logger.warning(f"parse_time_range error: {e}")
-            pass
+        except (ValueError, OverflowError, OSError) as e:
+            logger.warning("parse_time_range error: {}", e)
     
     return start_sec, end_sec
 
 
-def _task_matches_node_name(t: Dict[str, Any], node_name: str) -> bool:
-    """直接对整个 task 对象进行正则匹配 node_name"""
-    if not node_name:
-        return False
-    try:
-        # 将整个 task 对象序列化为 JSON 字符串
-        task_str = json.dumps(t, ensure_ascii=False)
-        # 使用正则表达式匹配 node_name（精确匹配，避免部分匹配）
-        # 转义特殊字符，确保精确匹配
-        escaped_name = re.escape(str(node_name))
-        pattern = rf'"{escaped_name}"'
-        return bool(re.search(pattern, task_str))
-    except Exception:
-        return False
-
-
-def _task_matches_instance_id(t: Dict[str, Any], instance_id: str) -> bool:
-    """直接对整个 task 对象进行正则匹配 instance_id"""
-    if not instance_id:
-        return False
-    try:
-        # 将整个 task 对象序列化为 JSON 字符串
-        task_str = json.dumps(t, ensure_ascii=False)
-        # 使用正则表达式匹配 instance_id（精确匹配，避免部分匹配）
-        # 转义特殊字符，确保精确匹配
-        escaped_id = re.escape(str(instance_id))
-        pattern = rf'"{escaped_id}"'
-        return bool(re.search(pattern, task_str))
-    except Exception:
+def _task_json_contains(task_str: str, value: Optional[str]) -> bool:
+    """在序列化后的 task JSON 中精确匹配某个字符串值（需作为完整的 JSON 字符串出现，避免部分匹配）"""
+    if not value:
         return False
+    return f'"{value}"' in task_str
 
 
 def task_matches_filters(
@@ -211,13 +194,13 @@ def task_matches_filters(
         if end_sec is not None and ts > end_sec:
             return False
     # node_name 与 instance_id：仅其一则要求匹配；同时传入时取并集（匹配其一即可）
-    match_node_name, match_instance_id = False, False
     if node_name or instance_id:
-        if _task_matches_node_name(t, node_name):
-            match_node_name = True
-        if _task_matches_instance_id(t, instance_id):
-            match_instance_id = True
-        if not match_node_name and not match_instance_id:
+        # 整个 task 只序列化一次，node_name 与 instance_id 共用同一份 JSON 字符串做匹配
+        try:
+            task_str = json.dumps(t, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return False
+        if not (_task_json_contains(task_str, node_name) or _task_json_contains(task_str, instance_id)):
             return False
     return True
 
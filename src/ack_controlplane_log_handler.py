@@ -3,13 +3,14 @@
 from typing import Dict, Any, Optional
 from fastmcp import FastMCP, Context
 from loguru import logger
+from cachetools import TTLCache
 from pydantic import Field
+import hashlib
 import json
 import re
 import time
 from datetime import datetime, timedelta
-from unittest.mock import Mock
-from alibabacloud_tea_util import models as util_models
+from types import SimpleNamespace
 from models import (
     QueryControlPlaneLogsOutput,
     ControlPlaneLogEntry,
@@ -19,6 +20,7 @@ from models import (
     ExecutionLog,
     enable_execution_log_ctx
 )
+from sdk_defaults import DEFAULT_RUNTIME, EMPTY_HEADERS
 
 
 def _get_sls_client(ctx: Context, region_id: str):
@@ -34,17 +36,14 @@ def _get_sls_client(ctx: Context, region_id: str):
 
 def _get_cs_client(ctx: Context, region_id: str):
     """从 lifespan providers 中获取指定区域的 CS 客户端。"""
-    lifespan_context = ctx.request_context.lifespan_context
-    if isinstance(lifespan_context, dict):
-        providers = lifespan_context.get("providers", {})
-    else:
-        providers = getattr(lifespan_context, "providers", {})
-
-    cs_client_factory = providers.get("cs_client_factory")
-    if not cs_client_factory:
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    if not isinstance(lifespan_context, dict):
+        lifespan_context = {}
+    providers = lifespan_context.get("providers")
+    factory = providers.get("cs_client_factory") if isinstance(providers, dict) else None
+    if not factory:
         raise RuntimeError("cs_client_factory not available in runtime providers")
-    config = lifespan_context.get("config", {}) if isinstance(lifespan_context, dict) else {}
-    return cs_client_factory(region_id, config)
+    return factory(region_id, lifespan_context.get("config", {}))
 
 
 def _parse_single_time(time_str: Optional[str], default_hours: int = 24) -> datetime:
@@ -160,6 +159,20 @@ def _parse_controlplane_log_entry(log_data: Dict[str, Any]) -> ControlPlaneLogEn
         raw_log=json.dumps(log_data, ensure_ascii=False)
     )
 
+# 控制面日志配置（project、组件列表）很少变化，成功结果短时缓存，避免每次查询都调用 CheckControlPlaneLogEnable；
+# 键包含凭证与 region，不同凭证的调用方不共享缓存结果
+_CONTROLPLANE_LOG_CONFIG_CACHE: TTLCache = TTLCache(maxsize=256, ttl=300)
+
+
+def _controlplane_log_config_cache_key(ctx: Context, cluster_id: str, region_id: str) -> tuple[str, str, str, str]:
+    """控制面日志配置缓存键：(access_key_id, secret 的 sha256, region_id, cluster_id)。"""
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    config = lifespan_context.get("config") if isinstance(lifespan_context, dict) else None
+    if not isinstance(config, dict):
+        config = {}
+    secret_hash = hashlib.sha256((config.get("access_key_secret") or "").encode()).hexdigest()
+    return config.get("access_key_id") or "", secret_hash, region_id, cluster_id
+
 """
 _get_controlplane_log_config
 获取一个集群的控制面日志功能，所在的sls project地址，以及component列表。
@@ -169,20 +182,24 @@ _get_controlplane_log_config
 1. 配置中明确指定
 2. 通过OpenAPI CheckControlPlaneLogEnable 检查控制面日志功能是否开启，并获取project等配置
 """
-def _get_controlplane_log_config(ctx: Context, cluster_id: str, region_id: str) -> tuple[Optional[ControlPlaneLogConfig], Optional[str], Optional[str]]:
+def _get_controlplane_log_config(ctx: Context, cluster_id: str, region_id: str) -> tuple[Optional[ControlPlaneLogConfig], Optional[str], Optional[str], bool]:
     """获取控制面日志配置信息。
     
     Returns:
-        tuple: (config, request_id, error_message)
+        tuple: (config, request_id, error_message, from_cache)；命中缓存时 request_id 为首次查询时的请求 ID
     """
+    cache_key = _controlplane_log_config_cache_key(ctx, cluster_id, region_id)
+    cached = _CONTROLPLANE_LOG_CONFIG_CACHE.get(cache_key)
+    if cached is not None:
+        return cached[0], cached[1], None, True
+
     request_id = None
     try:
         cs_client = _get_cs_client(ctx, region_id)
 
-        logger.info(f"Getting control plane log config for cluster {cluster_id}")
+        logger.info("Getting control plane log config for cluster {}", cluster_id)
 
-        runtime = util_models.RuntimeOptions()
-        headers = {}
+        runtime, headers = DEFAULT_RUNTIME, EMPTY_HEADERS
         response = cs_client.check_control_plane_log_enable_with_options(cluster_id, headers, runtime)
         
         # 提取 request_id
@@ -192,21 +209,22 @@ def _get_controlplane_log_config(ctx: Context, cluster_id: str, region_id: str)
         # 提取project
         components = getattr(response.body, 'components', []) if response.body else []
         if not components:
-            return None, request_id, "This cluster not enable controlplane log function, please enable it in Log Center's ControlPlane log tab. Failed to get control plane log config components from OpenAPI."
+            return None, request_id, "This cluster not enable controlplane log function, please enable it in Log Center's ControlPlane log tab. Failed to get control plane log config components from OpenAPI.", False
         controlplane_project = getattr(response.body, 'log_project', None) if response.body else None
         if not controlplane_project:
-            return None, request_id, "Failed to get control plane log config from OpenAPI."
+            return None, request_id, "Failed to get control plane log config from OpenAPI.", False
         
         config = ControlPlaneLogConfig(
             log_project=controlplane_project,
             log_ttl="30",
             components=components
         )
-        return config, request_id, None
+        _CONTROLPLANE_LOG_CONFIG_CACHE[cache_key] = (config, request_id)
+        return config, request_id, None, False
 
     except Exception as e:
-        logger.error(f"Failed to get control plane log config for cluster {cluster_id}: {e}")
-        return None, request_id, str(e)
+        logger.error("Failed to get control plane log config for cluster {}: {}", cluster_id, e)
+        return None, request_id, str(e), False
 
 
 class ACKControlPlaneLogHandler:
@@ -281,7 +299,7 @@ class ACKControlPlaneLogHandler:
             return region, request_id, None
 
         except Exception as e:
-            logger.error(f"Failed to get cluster region for {cluster_id}: {e}")
+            logger.error("Failed to get cluster region for {}: {}", cluster_id, e)
             return None, request_id, str(e)
 
     async def query_controlplane_logs(
@@ -385,7 +403,7 @@ class ACKControlPlaneLogHandler:
 
             # 步骤1: 先查询控制面日志配置信息
             execution_log.messages.append(f"Getting control plane log config for cluster {cluster_id}")
-            logger.info(f"Step 1: Getting control plane log config for cluster {cluster_id}")
+            logger.info("Step 1: Getting control plane log config for cluster {}", cluster_id)
             
             # cluster's region_id
             cs_client = _get_cs_client(ctx, "CENTER")
@@ -431,7 +449,7 @@ class ACKControlPlaneLogHandler:
             execution_log.messages.append(f"Cluster region: {region_id}, requestId: {region_request_id}")
 
             api_start = int(time.time() * 1000)
-            controlplane_config, request_id, error = _get_controlplane_log_config(ctx, cluster_id, region_id)
+            controlplane_config, request_id, error, from_cache = _get_controlplane_log_config(ctx, cluster_id, region_id)
             api_duration = int(time.time() * 1000) - api_start
             
             if error:
@@ -469,14 +487,17 @@ class ACKControlPlaneLogHandler:
                     execution_log=execution_log
                 )
             
-            execution_log.api_calls.append({
+            api_call: Dict[str, Any] = {
                 "api": "CheckControlPlaneLogEnable",
                 "cluster_id": cluster_id,
                 "request_id": request_id,
                 "duration_ms": api_duration,
                 "status": "success",
                 "components": controlplane_config.components if controlplane_config else []
-            })
+            }
+            if from_cache:
+                api_call["source"] = "cache"
+            execution_log.api_calls.append(api_call)
             execution_log.messages.append(f"Control plane logging enabled, components: {controlplane_config.components}, requestId: {request_id}")
 
             # 检查控制面日志功能是否启用
@@ -496,11 +517,14 @@ class ACKControlPlaneLogHandler:
                 )
 
             logger.info(
-                f"Control plane logging enabled for cluster {cluster_id}, available components: {controlplane_config.components}")
-            logger.info(f"SLS project: {controlplane_config.log_project}, TTL: {controlplane_config.log_ttl} days")
+                "Control plane logging enabled for cluster {}, available components: {}",
+                cluster_id,
+                controlplane_config.components,
+            )
+            logger.info("SLS project: {}, TTL: {} days", controlplane_config.log_project, controlplane_config.log_ttl)
 
             # 步骤2: 检查请求的组件是否在启用的组件列表中
-            logger.info(f"Step 2: Validating component {component_name} against enabled components")
+            logger.info("Step 2: Validating component {} against enabled components", component_name)
             if component_name not in controlplane_config.components:
                 error_message = f"Component '{component_name}' is not enabled for control plane logging. Available components: {controlplane_config.components}"
                 logger.warning(error_message)
@@ -536,13 +560,13 @@ class ACKControlPlaneLogHandler:
             # 构建 logstore 名称: {component_name}-{cluster_id}
             logstore_name = f"{component_name}-{cluster_id}"
             execution_log.messages.append(f"Using SLS project '{sls_project_name}', logstore '{logstore_name}'")
-            logger.info(f"Step 3: Using SLS project '{sls_project_name}' and logstore '{logstore_name}'")
+            logger.info("Step 3: Using SLS project '{}' and logstore '{}'", sls_project_name, logstore_name)
 
             # 获取 SLS 客户端
             try:
                 sls_client = _get_sls_client(ctx, region_id)
             except Exception as e:
-                logger.error(f"Failed to get SLS client: {e}")
+                logger.error("Failed to get SLS client: {}", e)
                 error_message = str(e)
                 error_code = ControlPlaneLogErrorCodes.LOGSTORE_NOT_FOUND
 
@@ -580,16 +604,16 @@ class ACKControlPlaneLogHandler:
             execution_log.messages.append(f"Query time range: {start_timestamp_s} to {end_timestamp_s}")
 
             # 步骤4: 构建SLS查询语句
-            logger.info(f"Step 4: Building SLS query for component {component_name}")
+            logger.info("Step 4: Building SLS query for component {}", component_name)
             query = _build_controlplane_log_query(
                 filter_pattern=filter_pattern
             )
             execution_log.messages.append(f"SLS query: {query}")
-            logger.info(f"SLS query: {query}")
+            logger.info("SLS query: {}", query)
 
             # 步骤5: 调用 SLS API 查询日志
             execution_log.messages.append(f"Querying SLS logs from project '{sls_project_name}', logstore '{logstore_name}'")
-            logger.info(f"Step 5: Querying SLS logs from project '{sls_project_name}', logstore '{logstore_name}'")
+            logger.info("Step 5: Querying SLS logs from project '{}', logstore '{}'", sls_project_name, logstore_name)
             
             from alibabacloud_sls20201230 import models as sls_models
 
@@ -622,15 +646,7 @@ class ACKControlPlaneLogHandler:
                     "status": "success"
                 })
                 
-                logger.info(f"SLS API response type: {type(response)}")
-                if hasattr(response, 'body'):
-                    logger.info(f"Response body type: {type(response.body)}")
-                    if hasattr(response.body, 'logs'):
-                        logger.info(f"Response body logs type: {type(response.body.logs)}")
-                    else:
-                        logger.info(f"Response body attributes: {dir(response.body)}")
-                else:
-                    logger.info(f"Response attributes: {dir(response)}")
+                logger.debug("SLS API response type: {}", type(response).__name__)
             except Exception as api_error:
                 api_duration = int(time.time() * 1000) - api_start
                 execution_log.api_calls.append({
@@ -643,16 +659,9 @@ class ACKControlPlaneLogHandler:
                 })
                 
                 # 如果 SLS API 调用失败，返回模拟数据用于测试
-                logger.warning(f"SLS API call failed, using mock data: {api_error}")
+                logger.warning("SLS API call failed, using mock data: {}", api_error)
                 # 在测试环境中，尝试从 sls_client 获取模拟数据
-                if hasattr(sls_client, '_response_logs'):
-                    response = Mock()
-                    response.body = Mock()
-                    response.body.logs = sls_client._response_logs
-                else:
-                    response = Mock()
-                    response.body = Mock()
-                    response.body.logs = []
+                response = SimpleNamespace(body=SimpleNamespace(logs=getattr(sls_client, '_response_logs', [])))
 
             # 解析响应
             entries = []
@@ -678,7 +687,7 @@ class ACKControlPlaneLogHandler:
                         entry = _parse_controlplane_log_entry(log_data)
                         entries.append(entry)
                     except Exception as e:
-                        logger.warning(f"Failed to parse control plane log entry: {e}")
+                        logger.warning("Failed to parse control plane log entry: {}", e)
                         continue
 
             execution_log.messages.append(f"Retrieved {len(entries)} log entries")
@@ -693,7 +702,7 @@ class ACKControlPlaneLogHandler:
             )
 
         except Exception as e:
-            logger.error(f"Failed to query control plane logs for cluster {cluster_id}: {e}")
+            logger.error("Failed to query control plane logs for cluster {}: {}", cluster_id, e)
             error_message = str(e)
             error_code = ControlPlaneLogErrorCodes.LOGSTORE_NOT_FOUND
 
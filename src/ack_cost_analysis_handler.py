@@ -20,13 +20,14 @@ from models import (
 
 def _get_cs_client(ctx: Context, region: str):
     """从 lifespan providers 中获取指定区域的 CS 客户端。"""
-    lifespan_context = getattr(ctx.request_context, "lifespan_context", {}) or {}
-    providers = lifespan_context.get("providers", {}) if isinstance(lifespan_context, dict) else {}
-    config = lifespan_context.get("config", {}) if isinstance(lifespan_context, dict) else {}
-    cs_client_factory = providers.get("cs_client_factory") if isinstance(providers, dict) else None
-    if not cs_client_factory:
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    if not isinstance(lifespan_context, dict):
+        lifespan_context = {}
+    providers = lifespan_context.get("providers")
+    factory = providers.get("cs_client_factory") if isinstance(providers, dict) else None
+    if not factory:
         raise RuntimeError("cs_client_factory not available in runtime providers")
-    return cs_client_factory(region, config)
+    return factory(region, lifespan_context.get("config", {}))
 
 
 class ACKCostAnalysisHandler:
@@ -147,7 +148,7 @@ class ACKCostAnalysisHandler:
             )
             
         except Exception as e:
-            logger.error(f"Failed to analyze workload cost: {e}")
+            logger.error("Failed to analyze workload cost: {}", e)
             execution_log.error = str(e)
             execution_log.end_time = datetime.utcnow().isoformat() + "Z"
             execution_log.duration_ms = int(time.time() * 1000) - start_ms
@@ -198,7 +199,7 @@ class ACKCostAnalysisHandler:
             )
             
             # 获取 workload spec（request/limit）
-            logger.debug(f"Fetching workload spec for {workload_type}/{workload_name}")
+            logger.debug("Fetching workload spec for {}/{}", workload_type, workload_name)
             cmd_spec = f"kubectl --kubeconfig {kubeconfig_path} get {workload_type} {workload_name} -n {namespace} -o json"
             result_spec = subprocess.run(cmd_spec, shell=True, capture_output=True, text=True, timeout=30)
             
@@ -245,10 +246,13 @@ class ACKCostAnalysisHandler:
                 if mem_lim and mem_lim != "0":
                     total_memory_limit_per_pod += self._parse_memory_to_mib(mem_lim)
             
-            logger.debug(f"Workload spec: cpu_request_per_pod={total_cpu_request_per_pod} cores, memory_request_per_pod={total_memory_request_per_pod}MiB")
+            logger.debug(
+                "Workload spec: cpu_request_per_pod={} cores, memory_request_per_pod={}MiB",
+                total_cpu_request_per_pod, total_memory_request_per_pod,
+            )
             
             # 获取 pods 列表
-            logger.debug(f"Fetching pods for {workload_type}/{workload_name}")
+            logger.debug("Fetching pods for {}/{}", workload_type, workload_name)
             label_selector = ",".join([f"{k}={v}" for k, v in pod_selector_labels.items()]) if pod_selector_labels else ""
             
             if label_selector:
@@ -260,14 +264,14 @@ class ACKCostAnalysisHandler:
             result_pods = subprocess.run(cmd_pods, shell=True, capture_output=True, text=True, timeout=30)
             
             if result_pods.returncode != 0:
-                logger.warning(f"Failed to get pods: {result_pods.stderr}")
+                logger.warning("Failed to get pods: {}", result_pods.stderr)
                 pod_list = []
             else:
                 try:
                     pods_data = json.loads(result_pods.stdout)
                     pod_list = pods_data.get("items", [])
                 except json.JSONDecodeError as e:
-                    logger.warning(f"Invalid JSON response from kubectl get pods: {e}")
+                    logger.warning("Invalid JSON response from kubectl get pods: {}", e)
                     pod_list = []
                 
                 # 如果没有 label selector，通过 owner reference 过滤
@@ -280,7 +284,7 @@ class ACKCostAnalysisHandler:
                         )
                     ]
             
-            logger.debug(f"Found {len(pod_list)} pods")
+            logger.debug("Found {} pods", len(pod_list))
             
             # 获取 kubectl top pods（瞬时使用量）
             instant_cpu_usage_total = 0
@@ -335,7 +339,10 @@ class ACKCostAnalysisHandler:
             cpu_limit_str = f"{total_cpu_limit_per_pod:.3f}" if total_cpu_limit_per_pod > 0 else None
             memory_limit_str = f"{int(total_memory_limit_per_pod)}Mi" if total_memory_limit_per_pod > 0 else None
             
-            logger.debug(f"Per-pod metrics: CPU usage={cpu_usage_str}, Memory usage={memory_usage_str}, CPU request={cpu_request_str}, Memory request={memory_request_str}")
+            logger.debug(
+                "Per-pod metrics: CPU usage={}, Memory usage={}, CPU request={}, Memory request={}",
+                cpu_usage_str, memory_usage_str, cpu_request_str, memory_request_str,
+            )
             
             # 计算资源利用率（利用率 = 实际使用量 / request 配置）
             resource_utilization = {}
@@ -350,9 +357,9 @@ class ACKCostAnalysisHandler:
                 resource_utilization["memory_utilization"] = 0.0
             
             logger.info(
-                f"Analysis complete: "
-                f"cpu_util={resource_utilization.get('cpu_utilization', 0):.2%}, "
-                f"mem_util={resource_utilization.get('memory_utilization', 0):.2%}"
+                "Analysis complete: cpu_util={:.2%}, mem_util={:.2%}",
+                resource_utilization.get('cpu_utilization', 0),
+                resource_utilization.get('memory_utilization', 0),
             )
             
             return {
@@ -367,7 +374,7 @@ class ACKCostAnalysisHandler:
                 "top_data_available": top_data_available,
             }
         except Exception as e:
-            logger.warning(f"Failed to analyze instant metrics, using defaults: {e}")
+            logger.warning("Failed to analyze instant metrics, using defaults: {}", e)
             return {
                 "cpu_request": None,
                 "memory_request": None,
@@ -429,7 +436,7 @@ class ACKCostAnalysisHandler:
             try:
                 data = json.loads(result.stdout)
             except json.JSONDecodeError as e:
-                logger.debug(f"Invalid JSON response from kubectl get recommendation: {e}")
+                logger.debug("Invalid JSON response from kubectl get recommendation: {}", e)
                 return None
             
             items = data.get("items", [])
@@ -473,7 +480,7 @@ class ACKCostAnalysisHandler:
                 "resource_recommendation_status": rec.get("metadata", {}).get("labels", {}).get("alpha.alibabacloud.com/recommendation-status", "")
             }
         except Exception as e:
-            logger.debug(f"No resource recommendation found: {e}")
+            logger.debug("No resource recommendation found: {}", e)
             return None
 
     def _parse_cpu_to_cores(self, cpu_str: str) -> float:
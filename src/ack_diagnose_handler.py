@@ -6,8 +6,6 @@ import json
 import time
 from datetime import datetime
 from alibabacloud_cs20151215 import models as cs20151215_models
-from alibabacloud_tea_util import models as util_models
-from typing import Dict, Any, Optional
 from models import (
     ErrorModel,
     GetDiagnoseResourceResultOutput,
@@ -16,43 +14,23 @@ from models import (
     ExecutionLog,
     enable_execution_log_ctx,
 )
+from sdk_defaults import DEFAULT_RUNTIME, EMPTY_HEADERS
 
 
-def _serialize_sdk_object(obj):
-    """序列化阿里云SDK对象为可JSON序列化的字典."""
-    if obj is None:
-        return None
-
-    if isinstance(obj, (str, int, float, bool)):
-        return obj
-
-    if isinstance(obj, (list, tuple)):
-        return [_serialize_sdk_object(item) for item in obj]
-
-    if isinstance(obj, dict):
-        return {key: _serialize_sdk_object(value) for key, value in obj.items()}
-
-    try:
-        if hasattr(obj, 'to_map'):
-            return obj.to_map()
-
-        if hasattr(obj, '__dict__'):
-            return _serialize_sdk_object(obj.__dict__)
-
-        return str(obj)
-    except Exception:
-        return str(obj)
+# 获取诊断结果不带额外参数；SDK 只做 validate 和读取字段，不会修改请求对象，可复用同一实例
+_DIAGNOSIS_RESULT_REQUEST = cs20151215_models.GetClusterDiagnosisResultRequest()
 
 
 def _get_cs_client(ctx: Context, region: str):
     """从 lifespan providers 中获取指定区域的 CS 客户端。"""
-    lifespan_context = getattr(ctx.request_context, "lifespan_context", {}) or {}
-    providers = lifespan_context.get("providers", {}) if isinstance(lifespan_context, dict) else {}
-    config = lifespan_context.get("config", {}) if isinstance(lifespan_context, dict) else {}
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    if not isinstance(lifespan_context, dict):
+        lifespan_context = {}
+    providers = lifespan_context.get("providers")
     factory = providers.get("cs_client_factory") if isinstance(providers, dict) else None
     if not factory:
         raise RuntimeError("cs_client_factory not available in runtime providers")
-    return factory(region, config)
+    return factory(region, lifespan_context.get("config", {}))
 
 
 class DiagnoseHandler:
@@ -135,8 +113,7 @@ class DiagnoseHandler:
                 type=resource_type,
                 target=target_dict
             )
-            runtime = util_models.RuntimeOptions()
-            headers = {}
+            runtime, headers = DEFAULT_RUNTIME, EMPTY_HEADERS
 
             # Call API with execution logging
             api_start = int(time.time() * 1000)
@@ -151,7 +128,8 @@ class DiagnoseHandler:
                 request_id = response.headers.get('x-acs-request-id', 'N/A')
 
             # 提取诊断任务ID
-            diagnose_task_id = getattr(response.body, 'diagnosis_id', None) if response.body else None
+            body = getattr(response, 'body', None)
+            diagnose_task_id = getattr(body, 'diagnosis_id', None) if body else None
             if not diagnose_task_id:
                 error_msg = "Failed to get diagnosis task ID from response"
                 execution_log.api_calls.append({
@@ -200,7 +178,7 @@ class DiagnoseHandler:
             return result
 
         except Exception as e:
-            logger.error(f"Failed to create cluster diagnosis: {e}")
+            logger.error("Failed to create cluster diagnosis: {}", e)
             error_code = "UnknownError"
             if "RESOURCE_NOT_FOUND" in str(e):
                 error_code = "RESOURCE_NOT_FOUND"
@@ -243,9 +221,8 @@ class DiagnoseHandler:
             cs_client = _get_cs_client(ctx, region_id)
 
             # 获取诊断结果请求（新版SDK使用 GetClusterDiagnosisResultRequest）
-            request = cs20151215_models.GetClusterDiagnosisResultRequest()
-            runtime = util_models.RuntimeOptions()
-            headers = {}
+            request = _DIAGNOSIS_RESULT_REQUEST
+            runtime, headers = DEFAULT_RUNTIME, EMPTY_HEADERS
 
             # Call API with execution logging
             api_start = int(time.time() * 1000)
@@ -261,7 +238,8 @@ class DiagnoseHandler:
             if hasattr(response, 'headers') and response.headers:
                 request_id = response.headers.get('x-acs-request-id', 'N/A')
 
-            if not response.body:
+            body = getattr(response, 'body', None)
+            if not body:
                 error_msg = "No response body from diagnosis result query"
                 execution_log.api_calls.append({
                     "api": "GetClusterDiagnosisResult",
@@ -285,12 +263,12 @@ class DiagnoseHandler:
                 }
 
             # 提取结果信息
-            result = getattr(response.body, 'result', None)
-            status = getattr(response.body, 'status', None)
-            code = getattr(response.body, 'code', None)
-            finished_time = getattr(response.body, 'finished', None)
-            resource_type = getattr(response.body, 'type', None)
-            resource_target = getattr(response.body, 'target', None)
+            result = getattr(body, 'result', None)
+            status = getattr(body, 'status', None)
+            code = getattr(body, 'code', None)
+            finished_time = getattr(body, 'finished', None)
+            resource_type = getattr(body, 'type', None)
+            resource_target = getattr(body, 'target', None)
             
             # Concise logging for success
             execution_log.api_calls.append({
@@ -317,7 +295,7 @@ class DiagnoseHandler:
             )
 
         except Exception as e:
-            logger.error(f"Failed to get diagnosis result: {e}")
+            logger.error("Failed to get diagnosis result: {}", e)
             error_code = "UnknownError"
             if "DIAGNOSE_TASK_FAILED" in str(e):
                 error_code = "DIAGNOSE_TASK_FAILED"
@@ -371,7 +349,7 @@ class DiagnoseHandler:
         max_end_time = start_time + timedelta(seconds=max_wait_time)
         poll_count = 0
         
-        logger.info(f"开始等待诊断任务 {diagnose_task_id} 完成，最大等待时间: {max_wait_time}秒")
+        logger.info("开始等待诊断任务 {} 完成，最大等待时间: {}秒", diagnose_task_id, max_wait_time)
         
         while datetime.now() < max_end_time:
             try:
@@ -399,7 +377,7 @@ class DiagnoseHandler:
                 
                 # 检查是否有错误
                 if isinstance(result, dict) and "error" in result:
-                    logger.error(f"获取诊断结果时出错: {result['error']}")
+                    logger.error("获取诊断结果时出错: {}", result['error'])
                     # Merge error info from poll if available
                     if poll_execution_log and hasattr(poll_execution_log, 'error') and poll_execution_log.error:
                         execution_log.error = poll_execution_log.error
@@ -409,32 +387,32 @@ class DiagnoseHandler:
                 status = result.status if hasattr(result, 'status') else None
                 code = result.code if hasattr(result, 'code') else None
                 
-                logger.info(f"诊断任务 {diagnose_task_id} 当前状态: {status}, 结果码: {code}")
+                logger.info("诊断任务 {} 当前状态: {}, 结果码: {}", diagnose_task_id, status, code)
                 
                 # 检查是否完成
                 if status == "COMPLETED":
-                    logger.info(f"诊断任务 {diagnose_task_id} 已完成")
+                    logger.info("诊断任务 {} 已完成", diagnose_task_id)
                     return result
                 elif status == "FAILED" or code == "FAILED":
-                    logger.warning(f"诊断任务 {diagnose_task_id} 失败")
+                    logger.warning("诊断任务 {} 失败", diagnose_task_id)
                     return result
                 elif status in ["CREATED", "RUNNING"]:
                     # 继续等待
                     elapsed_time = (datetime.now() - start_time).total_seconds()
                     remaining_time = max_wait_time - elapsed_time
-                    logger.info(f"论断任务 {diagnose_task_id} 仍在进行中，已等待 {elapsed_time:.1f}秒，剩余时间 {remaining_time:.1f}秒")
+                    logger.info("论断任务 {} 仍在进行中，已等待 {:.1f}秒，剩余时间 {:.1f}秒", diagnose_task_id, elapsed_time, remaining_time)
                     
                     # 等待指定间隔后继续轮询
                     await asyncio.sleep(poll_interval)
                     continue
                 else:
                     # 未知状态，继续等待
-                    logger.warning(f"诊断任务 {diagnose_task_id} 状态未知: {status}，继续等待")
+                    logger.warning("诊断任务 {} 状态未知: {}，继续等待", diagnose_task_id, status)
                     await asyncio.sleep(poll_interval)
                     continue
                     
             except Exception as e:
-                logger.error(f"轮询诊断结果时出错: {e}")
+                logger.error("轮询诊断结果时出错: {}", e)
                 execution_log.warnings.append(f"Poll #{poll_count} error: {str(e)}")
                 # 如果是网络错误等临时问题，继续重试
                 await asyncio.sleep(poll_interval)
@@ -3,11 +3,9 @@ from fastmcp import FastMCP, Context
 from loguru import logger
 from pydantic import Field
 from alibabacloud_cs20151215 import models as cs20151215_models
-from alibabacloud_tea_util import models as util_models
 import asyncio
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
 from models import (
     ErrorModel,
     QueryInspectReportOutput,
@@ -16,43 +14,24 @@ from models import (
     ExecutionLog,
     enable_execution_log_ctx,
 )
+from sdk_defaults import DEFAULT_RUNTIME, EMPTY_HEADERS
 
 
-def _serialize_sdk_object(obj):
-    """序列化阿里云SDK对象为可JSON序列化的字典."""
-    if obj is None:
-        return None
-
-    if isinstance(obj, (str, int, float, bool)):
-        return obj
-
-    if isinstance(obj, (list, tuple)):
-        return [_serialize_sdk_object(item) for item in obj]
-
-    if isinstance(obj, dict):
-        return {key: _serialize_sdk_object(value) for key, value in obj.items()}
-
-    try:
-        if hasattr(obj, 'to_map'):
-            return obj.to_map()
-
-        if hasattr(obj, '__dict__'):
-            return _serialize_sdk_object(obj.__dict__)
-
-        return str(obj)
-    except Exception:
-        return str(obj)
+# 参数固定的请求对象：SDK 只做 validate 和读取字段，不会修改请求对象，可复用同一实例
+_RUN_INSPECT_REQUEST = cs20151215_models.RunClusterInspectRequest()
+_LATEST_REPORT_REQUEST = cs20151215_models.ListClusterInspectReportsRequest(max_results=1)  # 只获取最新的一个报告
 
 
 def _get_cs_client(ctx: Context, region: str):
     """从 lifespan providers 中获取指定区域的 CS 客户端。"""
-    lifespan_context = getattr(ctx.request_context, "lifespan_context", {}) or {}
-    providers = lifespan_context.get("providers", {}) if isinstance(lifespan_context, dict) else {}
-    config = lifespan_context.get("config", {}) if isinstance(lifespan_context, dict) else {}
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    if not isinstance(lifespan_context, dict):
+        lifespan_context = {}
+    providers = lifespan_context.get("providers")
     factory = providers.get("cs_client_factory") if isinstance(providers, dict) else None
     if not factory:
         raise RuntimeError("cs_client_factory not available in runtime providers")
-    return factory(region, config)
+    return factory(region, lifespan_context.get("config", {}))
 
 
 class InspectHandler:
@@ -92,11 +71,10 @@ class InspectHandler:
         try:
             # 获取 CS 客户端
             cs_client = _get_cs_client(ctx, region_id)
-            runtime = util_models.RuntimeOptions()
-            headers = {}
+            runtime, headers = DEFAULT_RUNTIME, EMPTY_HEADERS
 
             # 1. 即刻创建集群巡检报告
-            create_request = cs20151215_models.RunClusterInspectRequest()
+            create_request = _RUN_INSPECT_REQUEST
             
             api_start = int(time.time() * 1000)
             request_id = None
@@ -109,7 +87,9 @@ class InspectHandler:
             if hasattr(create_response, 'headers') and create_response.headers:
                 request_id = create_response.headers.get('x-acs-request-id', 'N/A')
             
-            if not create_response.body or not create_response.body.report_id:
+            create_body = getattr(create_response, 'body', None)
+            created_report_id = getattr(create_body, 'report_id', None) if create_body else None
+            if not created_report_id:
                 error_msg = "创建巡检报告失败"
                 execution_log.api_calls.append({
                     "api": "RunClusterInspect",
@@ -131,7 +111,6 @@ class InspectHandler:
                     "execution_log": execution_log
                 }
             
-            created_report_id = create_response.body.report_id
             execution_log.api_calls.append({
                 "api": "RunClusterInspect",
                 "cluster_id": cluster_id,
@@ -145,9 +124,7 @@ class InspectHandler:
             await asyncio.sleep(1)
 
             # 2. 先获取巡检报告列表，找到最新的报告
-            list_request = cs20151215_models.ListClusterInspectReportsRequest(
-                max_results=1  # 只获取最新的一个报告
-            )
+            list_request = _LATEST_REPORT_REQUEST
 
             api_start = int(time.time() * 1000)
             request_id = None
@@ -160,7 +137,9 @@ class InspectHandler:
             if hasattr(list_response, 'headers') and list_response.headers:
                 request_id = list_response.headers.get('x-acs-request-id', 'N/A')
 
-            if not list_response.body or not list_response.body.reports:
+            list_body = getattr(list_response, 'body', None)
+            reports = getattr(list_body, 'reports', None) if list_body else None
+            if not reports:
                 error_msg = "当前没有已生成的巡检报告"
                 execution_log.api_calls.append({
                     "api": "ListClusterInspectReports",
@@ -183,7 +162,7 @@ class InspectHandler:
                 }
 
             # 获取最新的报告ID
-            latest_report = list_response.body.reports[0]
+            latest_report = reports[0]
             report_id = getattr(latest_report, 'report_id', None)
             if not report_id:
                 error_msg = "无法获取巡检报告ID"
@@ -232,7 +211,7 @@ class InspectHandler:
             return result
 
         except Exception as e:
-            logger.error(f"Failed to query inspect report: {e}")
+            logger.error("Failed to query inspect report: {}", e)
             error_code = "UnknownError"
             if "CLUSTER_NOT_FOUND" in str(e):
                 error_code = "CLUSTER_NOT_FOUND"
@@ -289,7 +268,7 @@ class InspectHandler:
             poll_interval = 0.1  # 100ms 用于测试
             max_wait_time = 10  # 10秒最大等待时间用于测试
         
-        logger.info(f"开始等待巡检报告 {report_id} 完成，最大等待时间: {max_wait_time}秒")
+        logger.info("开始等待巡检报告 {} 完成，最大等待时间: {}秒", report_id, max_wait_time)
         
         while datetime.now() < max_end_time:
             try:
@@ -315,7 +294,7 @@ class InspectHandler:
                 
                 # 检查是否有错误
                 if isinstance(result, dict) and "error" in result:
-                    logger.error(f"获取巡检报告结果时出错: {result['error']}")
+                    logger.error("获取巡检报告结果时出错: {}", result['error'])
                     if poll_execution_log and hasattr(poll_execution_log, 'error') and poll_execution_log.error:
                         execution_log.error = poll_execution_log.error
                     return result
@@ -323,32 +302,32 @@ class InspectHandler:
                 # 检查状态
                 status = result.report_status if hasattr(result, 'report_status') else None
                 
-                logger.info(f"巡检报告 {report_id} 当前状态: {status}")
+                logger.info("巡检报告 {} 当前状态: {}", report_id, status)
                 
                 # 检查是否完成
                 if status == "completed":
-                    logger.info(f"巡检报告 {report_id} 已完成")
+                    logger.info("巡检报告 {} 已完成", report_id)
                     return result
                 elif status == "failed":
-                    logger.warning(f"巡检报告 {report_id} 失败")
+                    logger.warning("巡检报告 {} 失败", report_id)
                     return result
                 elif status in ["running", "created"]:
                     # 继续等待
                     elapsed_time = (datetime.now() - start_time).total_seconds()
                     remaining_time = max_wait_time - elapsed_time
-                    logger.info(f"巡检报告 {report_id} 仍在进行中，已等待 {elapsed_time:.1f}秒，剩余时间 {remaining_time:.1f}秒")
+                    logger.info("巡检报告 {} 仍在进行中，已等待 {:.1f}秒，剩余时间 {:.1f}秒", report_id, elapsed_time, remaining_time)
                     
                     # 等待指定间隔后继续轮询
                     await asyncio.sleep(poll_interval)
                     continue
                 else:
                     # 未知状态，继续等待
-                    logger.warning(f"巡检报告 {report_id} 状态未知: {status}，继续等待")
+                    logger.warning("巡检报告 {} 状态未知: {}，继续等待", report_id, status)
                     await asyncio.sleep(poll_interval)
                     continue
                     
             except Exception as e:
-                logger.error(f"轮询巡检报告结果时出错: {e}")
+                logger.error("轮询巡检报告结果时出错: {}", e)
                 execution_log.warnings.append(f"Poll #{poll_count} error: {str(e)}")
                 # 如果是网络错误等临时问题，继续重试
                 await asyncio.sleep(poll_interval)
@@ -386,8 +365,7 @@ class InspectHandler:
         try:
             # 获取 CS 客户端
             cs_client = _get_cs_client(ctx, region_id)
-            runtime = util_models.RuntimeOptions()
-            headers = {}
+            runtime, headers = DEFAULT_RUNTIME, EMPTY_HEADERS
 
             # 获取巡检报告详情
             detail_request = cs20151215_models.GetClusterInspectReportDetailRequest(
@@ -405,7 +383,8 @@ class InspectHandler:
             if hasattr(detail_response, 'headers') and detail_response.headers:
                 request_id = detail_response.headers.get('x-acs-request-id', 'N/A')
 
-            if not detail_response.body:
+            body = getattr(detail_response, 'body', None)
+            if not body:
                 error_msg = "无法获取巡检报告详情"
                 execution_log.api_calls.append({
                     "api": "GetClusterInspectReportDetail",
@@ -429,7 +408,6 @@ class InspectHandler:
                 }
 
             # 解析响应数据
-            body = detail_response.body
             status = getattr(body, 'status', None)
 
             # 构建 summary
@@ -440,11 +418,9 @@ class InspectHandler:
                 normalCount=getattr(summary_data, 'normal_count', 0),
             )
 
-            # 构建 checkItemResults
-            check_items = []
-            check_item_results = getattr(body, 'check_item_results', []) or []
-            for item in check_item_results:
-                check_items.append(CheckItemResult(
+            # 构建 checkItemResults：直接从 SDK 对象逐项取字段，不经过中间 dict
+            check_items = [
+                CheckItemResult(
                     category=getattr(item, 'category', ''),
                     checkItemUid=getattr(item, 'check_item_uid', ''),
                     level=getattr(item, 'level', ''),
@@ -453,7 +429,9 @@ class InspectHandler:
                     targets=getattr(item, 'targets', []) or [],
                     description=getattr(item, 'description', ''),
                     fix=getattr(item, 'fix', ''),
-                ))
+                )
+                for item in getattr(body, 'check_item_results', None) or ()
+            ]
             
             # Log successful API call (concise)
             execution_log.api_calls.append({
@@ -479,7 +457,7 @@ class InspectHandler:
             )
 
         except Exception as e:
-            logger.error(f"Failed to get inspect report detail: {e}")
+            logger.error("Failed to get inspect report detail: {}", e)
             error_code = "UnknownError"
             if "CLUSTER_NOT_FOUND" in str(e):
                 error_code = "CLUSTER_NOT_FOUND"
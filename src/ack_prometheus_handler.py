@@ -2,11 +2,12 @@ from typing import Dict, Any, Optional, List
 from fastmcp import FastMCP, Context
 from loguru import logger
 from pydantic import Field
+import hashlib
 import httpx
 import os
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from cachetools import TTLCache
 from models import (
     ErrorModel,
     QueryPrometheusSeriesPoint,
@@ -17,6 +18,23 @@ from models import (
     ExecutionLog,
     enable_execution_log_ctx,
 )
+from sdk_defaults import DEFAULT_RUNTIME
+
+# 集群的 Prometheus 实例地址很少变化，ARMS 解析成功的 (endpoint, region_id) 短时缓存，
+# 避免每次查询都多一次 DescribeClusterDetail + GetPrometheusInstance 往返。
+# 键为 (access_key_id, secret 的 sha256, cluster_id, use_private)：不同凭证的调用方不共享缓存结果；
+# 集群所在 region 由 cluster_id 唯一确定（且正是命中缓存时要省掉的那次查询），无需再放进键里
+_ARMS_ENDPOINT_CACHE: TTLCache = TTLCache(maxsize=256, ttl=300)
+
+
+def _credential_scope(ctx: Context) -> tuple[str, str]:
+    """返回当前调用凭证的缓存作用域 (access_key_id, secret 的 sha256)。"""
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    config = lifespan_context.get("config") if isinstance(lifespan_context, dict) else None
+    if not isinstance(config, dict):
+        config = {}
+    secret = config.get("access_key_secret") or ""
+    return config.get("access_key_id") or "", hashlib.sha256(secret.encode()).hexdigest()
 
 
 class PrometheusHandler:
@@ -103,7 +121,7 @@ class PrometheusHandler:
             return region
 
         except Exception as e:
-            logger.error(f"Failed to get cluster region for {cluster_id}: {e}")
+            logger.error("Failed to get cluster region for {}: {}", cluster_id, e)
             raise ValueError(f"Failed to get cluster region for {cluster_id}: {e}")
 
 
@@ -129,31 +147,34 @@ class PrometheusHandler:
         if isinstance(endpoints, dict):
             ep = endpoints.get(cluster_id) or endpoints.get("default")
             if ep:
+                ep = ep.rstrip("/")
                 execution_log.api_calls.append({
                     "api": "GetPrometheusEndpoint",
                     "source": "static_config",
                     "mode": "LOCAL",
                     "cluster_id": cluster_id,
-                    "endpoint": ep.rstrip("/"),
+                    "endpoint": ep,
                     "status": "success"
                 })
-                return ep.rstrip("/")
+                return ep
 
         # 2) 环境变量：PROMETHEUS_HTTP_API_{cluster_id} 或 PROMETHEUS_HTTP_API
         env_key_specific = f"PROMETHEUS_HTTP_API_{cluster_id}"
         env_key_global = "PROMETHEUS_HTTP_API"
-        ep = os.getenv(env_key_specific) or os.getenv(env_key_global)
+        ep_specific = os.getenv(env_key_specific)
+        ep = ep_specific or os.getenv(env_key_global)
         if ep:
-            source = env_key_specific if os.getenv(env_key_specific) else env_key_global
+            ep = ep.rstrip("/")
+            source = env_key_specific if ep_specific else env_key_global
             execution_log.api_calls.append({
                 "api": "GetPrometheusEndpoint",
                 "source": f"env_var:{source}",
                 "mode": "LOCAL",
                 "cluster_id": cluster_id,
-                "endpoint": ep.rstrip("/"),
+                "endpoint": ep,
                 "status": "success"
             })
-            return ep.rstrip("/")
+            return ep
         return None
     
     def _resolve_from_arms(self, ctx: Context, providers: dict, cluster_id: str, execution_log: ExecutionLog, use_private: bool = False) -> Optional[str]:
@@ -169,6 +190,20 @@ class PrometheusHandler:
         # 1) 优先参考 alibabacloud-o11y-prometheus-mcp-server 中的方法：
         #    从 providers 里取 ARMS client，调用 GetPrometheusInstance
         mode = "ARMS_PRIVATE" if use_private else "ARMS_PUBLIC"
+        cache_key = (*_credential_scope(ctx), cluster_id, use_private)
+        cached = _ARMS_ENDPOINT_CACHE.get(cache_key)
+        if cached is not None:
+            cached_ep, cached_region_id = cached
+            execution_log.api_calls.append({
+                "api": "GetPrometheusInstance",
+                "source": "cache",
+                "mode": mode,
+                "cluster_id": cluster_id,
+                "region_id": cached_region_id,
+                "endpoint": cached_ep,
+                "status": "success"
+            })
+            return cached_ep
         try:
             cs_client = _get_cs_client(ctx, "CENTER")
             region_id = self._get_cluster_region(cs_client, cluster_id, execution_log)
@@ -177,9 +212,8 @@ class PrometheusHandler:
             if arms_client_factory and region_id:
                 arms_client = arms_client_factory(region_id, config)
                 from alibabacloud_arms20190808 import models as arms_models
-                from alibabacloud_tea_util import models as util_models
                 req = arms_models.GetPrometheusInstanceRequest(region_id=region_id, cluster_id=cluster_id)
-                runtime = util_models.RuntimeOptions()
+                runtime = DEFAULT_RUNTIME
                 
                 # Call ARMS API with execution logging
                 api_start = int(time.time() * 1000)
@@ -214,11 +248,13 @@ class PrometheusHandler:
                             "status": "success",
                             "endpoint_type": "private" if use_private else "public"
                         })
-                        return str(ep).rstrip('/')
+                        ep = str(ep).rstrip('/')
+                        _ARMS_ENDPOINT_CACHE[cache_key] = (ep, region_id)
+                        return ep
                 else:
                     execution_log.warnings.append(f"ARMS API returned no data for cluster {cluster_id}")
         except Exception as e:
-            logger.debug(f"resolve endpoint via ARMS failed: {e}")
+            logger.debug("resolve endpoint via ARMS failed: {}", e)
             execution_log.warnings.append(f"Failed to resolve endpoint via ARMS: {str(e)}")
 
         # 2) Fallback to local resolution
@@ -385,7 +421,7 @@ class PrometheusHandler:
             )
         
         except Exception as e:
-            logger.error(f"Failed to query prometheus: {e}")
+            logger.error("Failed to query prometheus: {}", e)
             execution_log.error = str(e)
             execution_log.end_time = datetime.utcnow().isoformat() + "Z"
             execution_log.duration_ms = int(time.time() * 1000) - start_ms
@@ -512,7 +548,7 @@ class PrometheusHandler:
             )
 
         except Exception as e:
-            logger.error(f"Error querying guidance data: {e}")
+            logger.error("Error querying guidance data: {}", e)
             execution_log.error = str(e)
             execution_log.end_time = datetime.utcnow().isoformat() + "Z"
             execution_log.duration_ms = int(time.time() * 1000) - start_ms
@@ -527,15 +563,11 @@ class PrometheusHandler:
 
 def _get_cs_client(ctx: Context, region_id: str):
     """从 lifespan providers 中获取指定区域的 CS 客户端。"""
-    lifespan_context = ctx.request_context.lifespan_context
-    if isinstance(lifespan_context, dict):
-        providers = lifespan_context.get("providers", {})
-        config = lifespan_context.get("config", {})
-    else:
-        providers = getattr(lifespan_context, "providers", {})
-        config = getattr(lifespan_context, "config", {}) if hasattr(lifespan_context, "config") else {}
-
-    cs_client_factory = providers.get("cs_client_factory")
-    if not cs_client_factory:
+    lifespan_context = getattr(ctx.request_context, "lifespan_context", None)
+    if not isinstance(lifespan_context, dict):
+        lifespan_context = {}
+    providers = lifespan_context.get("providers")
+    factory = providers.get("cs_client_factory") if isinstance(providers, dict) else None
+    if not factory:
         raise RuntimeError("cs_client_factory not available in runtime providers")
-    return cs_client_factory(region_id, config)
+    return factory(region_id, lifespan_context.get("config", {}))
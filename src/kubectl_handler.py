@@ -1,9 +1,8 @@
-from typing import Any
 from fastmcp import FastMCP, Context
 from pydantic import Field
 import os
 import subprocess
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 from cachetools import TTLCache
 from loguru import logger
 from ack_cluster_handler import parse_master_url
@@ -46,7 +45,7 @@ class KubectlContextManager(TTLCache):
                 else:
                     self.cleanup_all_mcp_files()
             except Exception as e:
-                logger.error(f"Cleanup failed: {e}")
+                logger.error("Cleanup failed: {}", e)
                 raise e
 
         def signal_handler(signum, frame):
@@ -94,7 +93,7 @@ class KubectlContextManager(TTLCache):
         """
         # 检查缓存中是否已存在
         if cluster_id in self:
-            logger.debug(f"Found cached kubeconfig for cluster {cluster_id}")
+            logger.debug("Found cached kubeconfig for cluster {}", cluster_id)
             execution_log.api_calls.append({
                 "api": "GetKubeconfig",
                 "source": "cache",
@@ -105,7 +104,7 @@ class KubectlContextManager(TTLCache):
 
         if kubeconfig_mode == "INCLUSTER":
             # 使用集群内配置
-            logger.debug(f"Using in-cluster kubeconfig for cluster {cluster_id}")
+            logger.debug("Using in-cluster kubeconfig for cluster {}", cluster_id)
             kubeconfig_path = self._construct_incluster_kubeconfig()
             execution_log.api_calls.append({
                 "api": "GetKubeconfig",
@@ -125,7 +124,7 @@ class KubectlContextManager(TTLCache):
             if not os.path.exists(kubeconfig_path):
                 raise ValueError(f"File {kubeconfig_path} does not exist")
             self.do_not_cleanup_file = kubeconfig_path
-            logger.debug(f"Using local kubeconfig for cluster {cluster_id} from {kubeconfig_path}")
+            logger.debug("Using local kubeconfig for cluster {} from {}", cluster_id, kubeconfig_path)
             execution_log.api_calls.append({
                 "api": "GetKubeconfig",
                 "source": "local_file",
@@ -163,13 +162,13 @@ class KubectlContextManager(TTLCache):
         # 删除 kubeconfig 文件
         if path and os.path.exists(path):
             if self.do_not_cleanup_file and os.path.samefile(path, self.do_not_cleanup_file):
-                logger.debug(f"Skipped removal of protected kubeconfig file: {path}")
+                logger.debug("Skipped removal of protected kubeconfig file: {}", path)
                 return
             try:
                 os.remove(path)
-                logger.debug(f"Removed cached kubeconfig file: {path}")
+                logger.debug("Removed cached kubeconfig file: {}", path)
             except Exception as e:
-                logger.warning(f"Failed to remove cached kubeconfig file {path}: {e}")
+                logger.warning("Failed to remove cached kubeconfig file {}: {}", path, e)
 
         return key, path
 
@@ -300,7 +299,7 @@ class KubectlContextManager(TTLCache):
                 request_id = response.headers.get('x-acs-request-id', 'N/A')
 
             if response and response.body and response.body.config:
-                logger.info(f"Successfully fetched kubeconfig for cluster {cluster_id} (TTL: {ttl_minutes} minutes)")
+                logger.info("Successfully fetched kubeconfig for cluster {} (TTL: {} minutes)", cluster_id, ttl_minutes)
                 if execution_log:
                     execution_log.api_calls.append({
                         "api": "DescribeClusterUserKubeconfig",
@@ -313,7 +312,7 @@ class KubectlContextManager(TTLCache):
                     })
                 return response.body.config
             else:
-                logger.warning(f"No kubeconfig found for cluster {cluster_id}")
+                logger.warning("No kubeconfig found for cluster {}", cluster_id)
                 if execution_log:
                     execution_log.api_calls.append({
                         "api": "DescribeClusterUserKubeconfig",
@@ -326,7 +325,7 @@ class KubectlContextManager(TTLCache):
                 return None
 
         except Exception as e:
-            logger.error(f"Failed to fetch kubeconfig for cluster {cluster_id}: {e}")
+            logger.error("Failed to fetch kubeconfig for cluster {}: {}", cluster_id, e)
             raise e
 
     def _construct_incluster_kubeconfig(self) -> str:
@@ -394,6 +393,18 @@ def get_context_manager(ttl_minutes: int = 60) -> KubectlContextManager:
     return _context_manager
 
 
+def _reject_command(
+        command: str, error: Optional[str], execution_log: ExecutionLog, start_ms: int, metadata: Dict[str, Any]
+) -> KubectlOutput:
+    """命令被拒绝（只读模式下的写命令、交互式命令）时统一填充执行日志并返回错误输出"""
+    error = error or f"Command rejected: {command}"
+    execution_log.error = error
+    execution_log.end_time = datetime.utcnow().isoformat() + "Z"
+    execution_log.duration_ms = int(time.time() * 1000) - start_ms
+    execution_log.metadata = metadata
+    return KubectlOutput(command=command, stdout="", stderr=error, exit_code=1, execution_log=execution_log)
+
+
 class KubectlHandler:
     """
         Handler for running kubectl commands via a FastMCP tool.
@@ -449,7 +460,7 @@ class KubectlHandler:
             else:
                 logger.warning("cs_client not available in lifespan context")
         except Exception as e:
-            logger.error(f"Failed to setup CS client: {e}")
+            logger.error("Failed to setup CS client: {}", e)
 
     def is_write_command(self, command: str) -> tuple[bool, Optional[str]]:
         """检查是否为可写命令
@@ -758,46 +769,26 @@ assistant: exec my-pod -- /bin/sh -c "your command here"""
             )
 
             try:
-                # 设置CS客户端
-                self._setup_cs_client(ctx)
-
-                # 检查是否为只读模式
+                # 检查是否为只读模式（写命令、交互式命令的拒绝路径不依赖 CS 客户端，先于其初始化判断）
                 if not self.allow_write:
                     is_write_command, not_allow_write_error = self.is_write_command(command)
                     if is_write_command:
-                        execution_log.error = not_allow_write_error
-                        execution_log.end_time = datetime.utcnow().isoformat() + "Z"
-                        execution_log.duration_ms = int(time.time() * 1000) - start_ms
-                        execution_log.metadata = {
+                        return _reject_command(command, not_allow_write_error, execution_log, start_ms, {
                             "error_type": "WriteCommandNotAllowed",
                             "command": command,
                             "allow_write": False
-                        }
-                        return KubectlOutput(
-                            command=command,
-                            stdout="",
-                            stderr=not_allow_write_error,
-                            exit_code=1,
-                            execution_log=execution_log
-                        )
+                        })
 
                 # 检查是否为交互式命令
                 is_interactive, interactive_error = self.is_interactive_command(command)
                 if is_interactive:
-                    execution_log.error = interactive_error
-                    execution_log.end_time = datetime.utcnow().isoformat() + "Z"
-                    execution_log.duration_ms = int(time.time() * 1000) - start_ms
-                    execution_log.metadata = {
+                    return _reject_command(command, interactive_error, execution_log, start_ms, {
                         "error_type": "InteractiveCommandNotSupported",
                         "command": command
-                    }
-                    return KubectlOutput(
-                        command=command,
-                        stdout="",
-                        stderr=interactive_error,
-                        exit_code=1,
-                        execution_log=execution_log
-                    )
+                    })
+
+                # 设置CS客户端（仅获取 kubeconfig 时需要）
+                self._setup_cs_client(ctx)
 
                 # 获取 kubeconfig 文件路径
                 context_manager = get_context_manager()
@@ -823,7 +814,7 @@ assistant: exec my-pod -- /bin/sh -c "your command here"""
                 )
 
             except Exception as e:
-                logger.error(f"kubectl tool execution error: {e}")
+                logger.error("kubectl tool execution error: {}", e)
                 execution_log.error = str(e)
                 execution_log.end_time = datetime.utcnow().isoformat() + "Z"
                 execution_log.duration_ms = int(time.time() * 1000) - start_ms
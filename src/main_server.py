@@ -20,8 +20,10 @@ to connect various sub-MCP servers.
 """
 
 import argparse
+import functools
 import os
 import sys
+from collections import ChainMap
 from typing import Dict, Any, Optional, Literal
 from loguru import logger
 from fastmcp import FastMCP
@@ -32,15 +34,6 @@ from ack_cost_analysis_handler import ACKCostAnalysisHandler
 from transport_security import TransportSecurityMiddleware, TransportSecuritySettings
 from ack_autoscaling_handler import ACKAutoscalingHandler
 
-# 尝试导入python-dotenv
-try:
-    from dotenv import load_dotenv
-
-    DOTENV_AVAILABLE = True
-except ImportError:
-    DOTENV_AVAILABLE = False
-    logger.warning("python-dotenv not available, environment variables will be read from system")
-
 from config import Configs
 from runtime_provider import ACKClusterRuntimeProvider
 from ack_cluster_handler import ACKClusterHandler
@@ -177,13 +170,95 @@ def create_main_server(
     return main_mcp
 
 
-def main():
-    """Run the main MCP server with CLI argument support."""
-    # 加载.env文件
-    if DOTENV_AVAILABLE:
-        load_dotenv()
-        logger.info("Loaded configuration from .env file")
-    
+def _env_int(env: Dict[str, str], name: str, default: int) -> int:
+    """从环境快照读取整数配置，未设置时返回默认值。"""
+    value = env.get(name)
+    return default if value is None else int(value)
+
+
+def _env_bool(env: Dict[str, str], name: str) -> bool:
+    """从环境快照读取布尔配置：仅 "true"（不区分大小写）为真，未设置时为 False。"""
+    return env.get(name, "").lower() == "true"
+
+
+# 命令行参数 > 环境变量 > 默认值 三层覆盖的配置项：(配置键, 命令行参数名, 环境变量名, 默认值)
+_LAYERED_SETTINGS = (
+    ("region_id", "region", "REGION_ID", "cn-hangzhou"),
+    ("access_key_id", "access_key_id", "ACCESS_KEY_ID", None),
+    ("access_key_secret", "access_key_secret", "ACCESS_KEY_SECRET", None),
+    ("kubeconfig_mode", "kubeconfig_mode", "KUBECONFIG_MODE", "ACK_PUBLIC"),
+    ("kubeconfig_path", "kubeconfig_path", "KUBECONFIG_PATH", "~/.kube/config"),
+    ("prometheus_endpoint_mode", "prometheus_endpoint_mode", "PROMETHEUS_ENDPOINT_MODE", "ARMS_PUBLIC"),
+)
+
+
+def _layered_settings(args: argparse.Namespace, env: Dict[str, str]) -> Dict[str, Any]:
+    """按 命令行参数 > 环境变量 > 默认值 合并三层配置（ChainMap 按层查找，只在最后物化一次）。"""
+    cli = {key: getattr(args, arg) for key, arg, _, _ in _LAYERED_SETTINGS if getattr(args, arg)}
+    from_env = {key: env[name] for key, _, name, _ in _LAYERED_SETTINGS if name in env}
+    defaults = {key: default for key, _, _, default in _LAYERED_SETTINGS}
+    return dict(ChainMap(cli, from_env, defaults))
+
+
+# 仅由环境变量控制的整数配置：(配置键, 环境变量名, 默认值)
+_ENV_INT_SETTINGS = (
+    ("cache_ttl", "CACHE_TTL", 300),
+    ("cache_max_size", "CACHE_MAX_SIZE", 1000),
+    ("diagnose_timeout", "DIAGNOSE_TIMEOUT", 600),  # 诊断超时时间（秒）
+    ("diagnose_poll_interval", "DIAGNOSE_POLL_INTERVAL", 15),  # 诊断轮询间隔（秒）
+    ("kubectl_timeout", "KUBECTL_TIMEOUT", 30),  # kubectl命令超时（秒）
+    ("api_timeout", "API_TIMEOUT", 60),  # API调用超时（秒）
+    ("max_inflight_cs_requests", "MAX_INFLIGHT_CS_REQUESTS", 16),  # 同时在途的 CS API 请求上限
+    ("detail_cache_ttl", "NODEPOOL_DETAIL_CACHE_TTL", 5),  # 节点池详情缓存时间（秒），0 表示不缓存
+)
+
+
+def _find_dotenv_file() -> Optional[str]:
+    """与 load_dotenv() 默认行为一致：从本模块所在目录逐级向上查找 .env，返回首个存在的文件路径。"""
+    path = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(path, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_dotenv(path: str, mtime: float) -> Dict[str, Optional[str]]:
+    """解析 .env 文件；按 (路径, 修改时间) 缓存，文件未变化时同一进程内重复加载不再读取和解析。"""
+    from dotenv import dotenv_values
+
+    return dict(dotenv_values(path))
+
+
+def _load_dotenv_if_present() -> None:
+    """仅在找到 .env 时才导入并加载 python-dotenv；容器内通过环境变量注入配置时跳过导入与解析。
+
+    与 load_dotenv() 一致：已存在的环境变量优先，不被 .env 覆盖。
+    """
+    dotenv_path = _find_dotenv_file()
+    if not dotenv_path:
+        return
+    try:
+        values = _parse_dotenv(dotenv_path, os.path.getmtime(dotenv_path))
+    except ImportError:
+        logger.warning("python-dotenv not available, environment variables will be read from system")
+        return
+    for key, value in values.items():
+        if value is not None and key not in os.environ:
+            os.environ[key] = value
+    logger.info("Loaded configuration from .env file: {}", dotenv_path)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器（进程内只构建一次）。
+
+    解析器本身不依赖环境变量；需要环境变量兜底的参数默认值为 None，由 main() 基于环境快照补齐。
+    """
     parser = argparse.ArgumentParser(
         description="AlibabaCloud Container Service Main MCP Server with Microservices Architecture"
     )
@@ -262,7 +337,7 @@ def main():
     parser.add_argument(
         "--allowed-origins",
         type=str,
-        default=os.environ.get("ALLOWED_ORIGINS", ""),
+        default=None,
         help="Comma-separated list of allowed origins for Origin header validation (env: ALLOWED_ORIGINS)"
     )
     parser.add_argument(
@@ -271,57 +346,53 @@ def main():
         action="version",
         version="%(prog)s 1.0.0"
     )
-    
-    args = parser.parse_args()
-    
+    return parser
+
+
+def main():
+    """Run the main MCP server with CLI argument support."""
+    # 加载.env文件
+    _load_dotenv_if_present()
+
+    args = _get_parser().parse_args()
+
+    # 环境变量在 .env 加载后只读取一次快照，后续配置项直接查普通 dict，不再逐项访问 os.environ
+    env = dict(os.environ)
+
     # Configure logging
     logger.remove()
-    logger.add(sys.stderr, level=os.getenv('FASTMCP_LOG_LEVEL', 'INFO'))
+    log_level = env.get("FASTMCP_LOG_LEVEL", "INFO")
+    logger.add(sys.stderr, level=log_level)
     
     # 构建完整的配置字典，优先级：命令行参数 > 环境变量 > 默认值
+    layered = _layered_settings(args, env)
     settings_dict = {
         # 基本配置
         "allow_write": args.allow_write,
         "transport": args.transport,
         "host": args.host,
         "port": args.port,
-        
+
         # ExecutionLog 配置
-        "enable_execution_log": args.enable_execution_log or os.getenv("ENABLE_EXECUTION_LOG", "false").lower() == "true",
-        
-        # 阿里云认证配置
-        "region_id": args.region or os.getenv("REGION_ID", "cn-hangzhou"),
-        "access_key_id": args.access_key_id or os.getenv("ACCESS_KEY_ID"),
-        "access_key_secret": args.access_key_secret or os.getenv("ACCESS_KEY_SECRET"),
+        "enable_execution_log": args.enable_execution_log or _env_bool(env, "ENABLE_EXECUTION_LOG"),
 
         # 审计日志配置
         "audit_config_path": args.audit_config,
         "audit_config_dict": None,
-        
+
         # 额外的环境配置
-        "cache_ttl": int(os.getenv("CACHE_TTL", "300")),
-        "cache_max_size": int(os.getenv("CACHE_MAX_SIZE", "1000")),
-        "fastmcp_log_level": os.getenv("FASTMCP_LOG_LEVEL", "INFO"),
-        "development": os.getenv("DEVELOPMENT", "false").lower() == "true",
-        
-        # 超时配置
-        "diagnose_timeout": int(os.getenv("DIAGNOSE_TIMEOUT", "600")),  # 诊断超时时间（秒）
-        "diagnose_poll_interval": int(os.getenv("DIAGNOSE_POLL_INTERVAL", "15")),  # 诊断轮询间隔（秒）
-        "kubectl_timeout": int(os.getenv("KUBECTL_TIMEOUT", "30")),  # kubectl命令超时（秒）
-        "api_timeout": int(os.getenv("API_TIMEOUT", "60")),  # API调用超时（秒）
-        
+        "fastmcp_log_level": log_level,
+        "development": _env_bool(env, "DEVELOPMENT"),
+
         # 兼容性配置
-        "access_secret_key": args.access_key_secret or os.getenv("ACCESS_KEY_SECRET"),  # 兼容旧字段名
+        "access_secret_key": layered["access_key_secret"],  # 兼容旧字段名
         "original_settings": Configs(vars(args)),
-
-        # ACK kubectl 配置
-        "kubeconfig_mode": args.kubeconfig_mode or os.getenv("KUBECONFIG_MODE", "ACK_PUBLIC"),
-        "kubeconfig_path": args.kubeconfig_path or os.getenv("KUBECONFIG_PATH", "~/.kube/config"),
-        
-        # Prometheus 配置
-        "prometheus_endpoint_mode": args.prometheus_endpoint_mode or os.getenv("PROMETHEUS_ENDPOINT_MODE", "ARMS_PUBLIC"),
     }
-    
+    # 阿里云认证、ACK kubectl、Prometheus 配置（命令行参数 > 环境变量 > 默认值）
+    settings_dict.update(layered)
+    # 缓存、超时、并发等整数配置（环境变量 > 默认值）
+    settings_dict.update({key: _env_int(env, name, default) for key, name, default in _ENV_INT_SETTINGS})
+
     # 验证必要的配置
     if not settings_dict.get("access_key_id"):
         logger.warning("⚠️  未配置ACCESS_KEY_ID，部分功能可能无法使用")
@@ -336,12 +407,12 @@ def main():
         mode_info.append("audit log enabled")
 
     mode_str = " in " + ", ".join(mode_info) if mode_info else ""
-    logger.info(f"Starting AlibabaCloud Container Service Main MCP Server{mode_str}")
-    logger.info(f"Region: {settings_dict['region_id']}")
+    logger.info("Starting AlibabaCloud Container Service Main MCP Server{}", mode_str)
+    logger.info("Region: {}", settings_dict['region_id'])
 
     # 记录敏感信息（隐藏部分内容）
     if settings_dict.get('access_key_id'):
-        logger.info(f"Access Key ID: {settings_dict['access_key_id'][:8]}***")
+        logger.opt(lazy=True).info("Access Key ID: {}***", lambda: settings_dict['access_key_id'][:8])
 
     try:
         # Create the main MCP server with proxy mounts
@@ -353,23 +424,26 @@ def main():
         )
 
         # Run server with specified transport
-        logger.info(f"Starting main server with {args.transport} transport...")
+        logger.info("Starting main server with {} transport...", args.transport)
         if args.transport == "stdio":
             logger.info("Starting stdio server...")
             main_server.run()
         elif args.transport == "http" or args.transport == "sse":
-            # Parse allowed origins for Origin header validation
+            # Parse allowed origins for Origin header validation（命令行未指定时回退到环境变量 ALLOWED_ORIGINS）
+            allowed_origins_arg = (
+                args.allowed_origins if args.allowed_origins is not None else env.get("ALLOWED_ORIGINS", "")
+            )
             allowed_origins = (
-                [o.strip() for o in args.allowed_origins.split(",") if o.strip()] if args.allowed_origins else []
+                [o.strip() for o in allowed_origins_arg.split(",") if o.strip()] if allowed_origins_arg else []
             )
 
-            logger.info(f"Origin validation enabled with allowed origins: {allowed_origins}")
+            logger.info("Origin validation enabled with allowed origins: {}", allowed_origins)
             main_server.add_middleware(TransportSecurityMiddleware(
                 settings=TransportSecuritySettings(
                     enable_dns_rebinding_protection=True,
                     allowed_origins=allowed_origins,
                 )))
-            logger.info(f"Server will be available at http://{args.host}:{args.port}")
+            logger.info("Server will be available at http://{}:{}", args.host, args.port)
             main_server.run(
                 transport=args.transport,
                 host=args.host,
@@ -380,7 +454,7 @@ def main():
         logger.info("Received shutdown signal...")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Main server error: {e}")
+        logger.error("Main server error: {}", e)
         sys.exit(1)
 
 
@@ -1,7 +1,6 @@
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, model_serializer
 from enum import Enum
-from typing import Optional, List, Dict, Any
 from loguru import logger
 import contextvars
 
@@ -41,11 +40,11 @@ class ExecutionLog(BaseModel):
         
         # Choose log level based on execution status
         if self.error:
-            logger.error(f"ExecutionLog [ERROR]: {log_data}")
+            logger.error("ExecutionLog [ERROR]: {}", log_data)
         elif self.warnings:
-            logger.warning(f"ExecutionLog [WARNING]: {log_data}")
+            logger.warning("ExecutionLog [WARNING]: {}", log_data)
         else:
-            logger.info(f"ExecutionLog [SUCCESS]: {log_data}")
+            logger.info("ExecutionLog [SUCCESS]: {}", log_data)
 
 
 class BaseOutputModel(BaseModel):
@@ -263,6 +262,7 @@ class ClusterErrorCodes:
     NO_RAM_POLICY_AUTH = "NO_RAM_POLICY_AUTH"
     MISS_REGION_ID = "MISS_REGION_ID"
     INVALID_CLUSTER_ID = "INVALID_CLUSTER_ID"
+    INVALID_NODEPOOL_IDS = "INVALID_NODEPOOL_IDS"
 
 
 # ACK Audit Log Models
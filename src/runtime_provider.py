@@ -2,8 +2,9 @@
 
 import os
 import json
+import hashlib
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Optional
 from loguru import logger
 from fastmcp import FastMCP
 from alibabacloud_cs20151215.client import Client as CS20151215Client
@@ -11,6 +12,7 @@ from alibabacloud_arms20190808.client import Client as ARMSClient
 from alibabacloud_tea_openapi import models as open_api_models
 from alibabacloud_credentials.client import Client as CredentialClient
 from alibabacloud_sls20201230.client import Client as SLSClient
+from cachetools import LRUCache
 
 # 添加父目录到路径以导入interfaces
 import sys
@@ -21,10 +23,22 @@ try:
 except ImportError:
     from .interfaces.runtime_provider import RuntimeProvider
 
+# 各类 SDK 客户端缓存的容量上限（按 region × AK 组合计），超出后淘汰最久未使用的客户端
+_CLIENT_CACHE_MAX_SIZE = 64
+
+
+def _client_cache_key(region: Optional[str], access_key_id: Optional[str], access_key_secret: Optional[str]) -> tuple:
+    """客户端缓存键：(region, access_key_id, secret 的 sha256)，不在长期存活的缓存结构中保存明文 secret。"""
+    secret_hash = hashlib.sha256(access_key_secret.encode()).hexdigest() if access_key_secret else None
+    return region, access_key_id, secret_hash
+
 
 class ACKClusterRuntimeProvider(RuntimeProvider):
     """Runtime provider for ACK Cluster Handler."""
 
+    # 指引文件随包发布、运行期不变：首次成功加载后在实例上复用，避免每次查询重新读取并解析全部 JSON
+    _prometheus_guidance: Optional[Dict[str, Any]] = None
+
     @asynccontextmanager
     async def init_runtime(self, app: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         """Initialize runtime context for ACK Cluster Handler."""
@@ -54,57 +68,85 @@ class ACKClusterRuntimeProvider(RuntimeProvider):
         # 初始化凭证客户端（使用全局默认凭证链）
         try:
             credential_client = CredentialClient()
+            # CS 客户端无请求级状态，按 (endpoint, AK) 复用，避免每次工具调用重复构建 Config/Client
+            cs_clients: LRUCache = LRUCache(maxsize=_CLIENT_CACHE_MAX_SIZE)
+
             def cs_client_factory(target_region: str, cfg: Dict[str, Any]) -> CS20151215Client:
-                """每次调用都重新创建 CS 客户端，不使用缓存。统一入参 (region_id, config)。"""
+                """按 (region, AK) 缓存 CS 客户端。统一入参 (region_id, config)。"""
                 effective_cfg = (cfg or {})
+                access_key_id = effective_cfg.get("access_key_id")
+                access_key_secret = effective_cfg.get("access_key_secret")
+                # 如果传入的 target_region = "CENTER"，则使用中心化endpoint
+                is_center = target_region == "CENTER"
+                region_id = None if is_center else (
+                    target_region or effective_cfg.get("region_id") or config.get("region_id")
+                )
+                cache_key = _client_cache_key("CENTER" if is_center else region_id, access_key_id, access_key_secret)
+                client = cs_clients.get(cache_key)
+                if client is not None:
+                    return client
+
                 cs_config = open_api_models.Config(credential=credential_client)
                 # 明确支持通过 config 覆盖 AK 信息
-                if effective_cfg.get("access_key_id"):
-                    cs_config.access_key_id = effective_cfg.get("access_key_id")
-                if effective_cfg.get("access_key_secret"):
-                    cs_config.access_key_secret = effective_cfg.get("access_key_secret")
+                if access_key_id:
+                    cs_config.access_key_id = access_key_id
+                if access_key_secret:
+                    cs_config.access_key_secret = access_key_secret
 
-                # 如果传入的 target_region = "CENTER"，则使用中心化endpoint
-                if target_region == "CENTER":
+                if is_center:
                     cs_config.endpoint = "cs.aliyuncs.com"
                 else:
-                    cs_config.region_id = target_region or effective_cfg.get("region_id") or config.get("region_id")
-                    cs_config.endpoint = f"cs.{cs_config.region_id}.aliyuncs.com"
+                    cs_config.region_id = region_id
+                    cs_config.endpoint = f"cs.{region_id}.aliyuncs.com"
                 client = CS20151215Client(cs_config)
-                logger.debug(f"Created new CS client for region: {target_region}")
+                cs_clients[cache_key] = client
+                logger.debug("Created new CS client for region: {}", target_region)
                 return client
 
             providers["cs_client_factory"] = cs_client_factory
             logger.info("ACK Cluster Handler providers initialized (cs_client_factory ready)")
         except Exception as e:
-            logger.warning(f"Initialize providers partially without CS factory: {e}")
+            logger.warning("Initialize providers partially without CS factory: {}", e)
             providers["cs_client_factory"] = None
 
         # 初始化 ARMS Client Factory（Prometheus 管理端点解析使用）
         try:
+            arms_clients: LRUCache = LRUCache(maxsize=_CLIENT_CACHE_MAX_SIZE)
+
             def arms_client_factory(region_id: str, cfg: Dict[str, Any]) -> ARMSClient:
-                """统一入参 (region_id, config) 创建 ARMS 客户端。"""
+                """统一入参 (region_id, config) 创建 ARMS 客户端，按 (region, AK) 缓存复用。"""
                 effective_cfg = (cfg or {})
-                arms_cfg = open_api_models.Config(credential=credential_client)
-                if effective_cfg.get("access_key_id"):
-                    arms_cfg.access_key_id = effective_cfg.get("access_key_id")
-                if effective_cfg.get("access_key_secret"):
-                    arms_cfg.access_key_secret = effective_cfg.get("access_key_secret")
+                access_key_id = effective_cfg.get("access_key_id")
+                access_key_secret = effective_cfg.get("access_key_secret")
                 region = region_id or effective_cfg.get("region_id") or config.get("region_id") or "cn-hangzhou"
+                cache_key = _client_cache_key(region, access_key_id, access_key_secret)
+                client = arms_clients.get(cache_key)
+                if client is not None:
+                    return client
+
+                arms_cfg = open_api_models.Config(credential=credential_client)
+                if access_key_id:
+                    arms_cfg.access_key_id = access_key_id
+                if access_key_secret:
+                    arms_cfg.access_key_secret = access_key_secret
                 arms_cfg.region_id = region
                 arms_cfg.endpoint = f"arms.{region}.aliyuncs.com"
-                return ARMSClient(arms_cfg)
+                client = ARMSClient(arms_cfg)
+                arms_clients[cache_key] = client
+                return client
 
             providers["arms_client_factory"] = arms_client_factory
             logger.info("ARMS client factory initialized")
         except Exception as e:
-            logger.warning(f"Initialize ARMS client factory failed: {e}")
+            logger.warning("Initialize ARMS client factory failed: {}", e)
             providers["arms_client_factory"] = None
 
         # 初始化 SLS Client Factory（审计日志查询使用）
         try:
+            sls_clients: LRUCache = LRUCache(maxsize=_CLIENT_CACHE_MAX_SIZE)
+
             def sls_client_factory(region_id: str, cfg: Dict[str, Any]):
-                """每次调用都重新创建 SLS 客户端，不使用缓存。"""
+                """创建 SLS 客户端，按 (region, AK) 缓存复用。"""
                 try:
                     # 获取访问密钥
                     effective_cfg = (cfg or {})
@@ -114,6 +156,11 @@ class ACKClusterRuntimeProvider(RuntimeProvider):
                     if not access_key_id or not access_key_secret:
                         raise ValueError("SLS access key credentials not found in config or environment variables")
 
+                    cache_key = _client_cache_key(region_id, access_key_id, access_key_secret)
+                    cached = sls_clients.get(cache_key)
+                    if cached is not None:
+                        return cached
+
                     # 构建 SLS 配置
                     sls_config = open_api_models.Config(
                         access_key_id=access_key_id,
@@ -126,30 +173,40 @@ class ACKClusterRuntimeProvider(RuntimeProvider):
 
                     # 创建 SLS 客户端
                     sls_client = SLSClient(sls_config)
+                    sls_clients[cache_key] = sls_client
 
-                    logger.debug(f"Created new SLS client for region {region_id}")
+                    logger.debug("Created new SLS client for region {}", region_id)
                     return sls_client
 
                 except Exception as e:
-                    logger.error(f"Failed to create SLS client for region {region_id}: {e}")
+                    logger.error("Failed to create SLS client for region {}: {}", region_id, e)
                     raise RuntimeError(f"SLS client initialization failed: {str(e)}")
             providers["sls_client_factory"] = sls_client_factory
             logger.info("SLS client factory initialized")
         except Exception as e:
-            logger.warning(f"Initialize SLS client factory failed: {e}")
+            logger.warning("Initialize SLS client factory failed: {}", e)
             providers["sls_client_factory"] = None
 
         # 初始化 Prometheus 指标指引
         try:
-            prometheus_guidance = self.initialize_prometheus_guidance()
+            prometheus_guidance = self._get_prometheus_guidance()
             providers["prometheus_guidance"] = prometheus_guidance
             logger.info("Prometheus guidance initialized")
         except Exception as e:
-            logger.warning(f"Initialize Prometheus guidance failed: {e}")
+            logger.warning("Initialize Prometheus guidance failed: {}", e)
             providers["prometheus_guidance"] = None
 
         return providers
 
+    def _get_prometheus_guidance(self) -> Dict[str, Any]:
+        """返回 Prometheus 指标指引数据；仅缓存初始化成功的结果，失败时下次调用重新加载。"""
+        guidance = self._prometheus_guidance
+        if guidance is None:
+            guidance = self.initialize_prometheus_guidance()
+            if guidance and guidance.get("initialized"):
+                self._prometheus_guidance = guidance
+        return guidance
+
     def initialize_prometheus_guidance(self) -> Dict[str, Any]:
         """初始化 Prometheus 指标指引数据。"""
         base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -174,7 +231,7 @@ class ACKClusterRuntimeProvider(RuntimeProvider):
                 guidance_data["promql_best_practice"] = self._load_promql_best_practice(promql_practice_dir)
                 
         except Exception as e:
-            logger.error(f"Failed to initialize Prometheus guidance: {e}")
+            logger.error("Failed to initialize Prometheus guidance: {}", e)
             guidance_data["initialized"] = False
             guidance_data["error"] = str(e)
             
@@ -198,7 +255,7 @@ class ACKClusterRuntimeProvider(RuntimeProvider):
                 metrics_data[key] = data
                 
             except Exception as e:
-                logger.warning(f"Failed to load metrics dictionary file {filename}: {e}")
+                logger.warning("Failed to load metrics dictionary file {}: {}", filename, e)
                 continue
                 
         return metrics_data
@@ -221,15 +278,14 @@ class ACKClusterRuntimeProvider(RuntimeProvider):
                 practice_data[key] = data
                 
             except Exception as e:
-                logger.warning(f"Failed to load PromQL best practice file {filename}: {e}")
+                logger.warning("Failed to load PromQL best practice file {}: {}", filename, e)
                 continue
                 
         return practice_data
 
     def query_metrics_by_category_and_label(self, category: str, resource_label: str) -> List[Dict[str, Any]]:
         """根据分类和资源标签查询指标定义。"""
-        # 重新初始化指引数据
-        guidance = self.initialize_prometheus_guidance()
+        guidance = self._get_prometheus_guidance()
         if not guidance or not guidance.get("initialized"):
             return []
             
@@ -268,8 +324,7 @@ class ACKClusterRuntimeProvider(RuntimeProvider):
 
     def query_promql_practices_by_category_and_label(self, category: str, resource_label: str) -> List[Dict[str, Any]]:
         """根据分类和资源标签查询 PromQL 最佳实践。"""
-        # 重新初始化指引数据
-        guidance = self.initialize_prometheus_guidance()
+        guidance = self._get_prometheus_guidance()
         if not guidance or not guidance.get("initialized"):
             return []
             
@@ -0,0 +1,9 @@
+"""各 handler 调用阿里云 SDK 时共用的默认参数。"""
+
+from typing import Dict
+
+from alibabacloud_tea_util import models as util_models
+
+# SDK 只读取 runtime 与 headers 而不修改（headers 会被 merge 复制），可在各次调用间共享同一实例
+DEFAULT_RUNTIME = util_models.RuntimeOptions()
+EMPTY_HEADERS: Dict[str, str] = {}
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 添加 src 目录到 Python 路径，各测试模块可直接 import 被测模块；conftest 在收集前只加载一次
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
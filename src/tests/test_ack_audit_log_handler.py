@@ -1,10 +1,3 @@
-import pytest
-import sys
-import os
-
-# 添加 src 目录到 Python 路径
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 import ack_audit_log_handler as module_under_test
 from models import (
     QueryAuditLogsOutput, 
@@ -98,8 +91,7 @@ def make_handler_and_tool(settings=None, tool_name="query_audit_log"):
     return handler, tool
 
 
-@pytest.mark.asyncio
-async def test_query_audit_logs_success():
+def test_query_audit_logs_success():
     """测试成功查询审计日志"""
     fake_logs = [
         {
@@ -159,8 +151,7 @@ async def test_query_audit_logs_success():
     # 简化检查
 
 
-@pytest.mark.asyncio
-async def test_query_audit_logs_no_sls_client():
+def test_query_audit_logs_no_sls_client():
     """测试 SLS 客户端不可用的情况"""
     handler = module_under_test.ACKAuditLogHandler(None, {"access_key_id": "ak", "access_key_secret": "sk"})
 
@@ -189,8 +180,7 @@ async def test_query_audit_logs_no_sls_client():
         assert "sls_client_factory" in str(e)
 
 
-@pytest.mark.asyncio
-async def test_query_audit_logs_missing_cluster_id():
+def test_query_audit_logs_missing_cluster_id():
     """测试缺少 cluster_id 参数的情况"""
     handler = module_under_test.ACKAuditLogHandler(None, {"access_key_id": "ak", "access_key_secret": "sk"})
 
@@ -219,8 +209,7 @@ async def test_query_audit_logs_missing_cluster_id():
         pass
 
 
-@pytest.mark.asyncio
-async def test_query_audit_logs_empty_result():
+def test_query_audit_logs_empty_result():
     """测试返回空结果的情况"""
     handler = module_under_test.ACKAuditLogHandler(None, {"access_key_id": "ak", "access_key_secret": "sk"})
 
@@ -249,8 +238,7 @@ async def test_query_audit_logs_empty_result():
     # 简化检查
 
 
-@pytest.mark.asyncio
-async def test_query_audit_logs_with_filters():
+def test_query_audit_logs_with_filters():
     """测试带过滤条件的查询"""
     fake_logs = [
         {
@@ -303,8 +291,7 @@ async def test_query_audit_logs_with_filters():
     # 简化检查
 
 
-@pytest.mark.asyncio
-async def test_query_audit_logs_limit_validation():
+def test_query_audit_logs_limit_validation():
     """测试结果限制验证"""
     handler = module_under_test.ACKAuditLogHandler(None, {"access_key_id": "ak", "access_key_secret": "sk"})
 
@@ -332,8 +319,7 @@ async def test_query_audit_logs_limit_validation():
     # 简化检查
 
 
-@pytest.mark.asyncio
-async def test_query_audit_logs_audit_not_enabled():
+def test_query_audit_logs_audit_not_enabled():
     """测试审计功能未启用的情况"""
     handler = module_under_test.ACKAuditLogHandler(None, {"access_key_id": "ak", "access_key_secret": "sk"})
 
@@ -362,8 +348,7 @@ async def test_query_audit_logs_audit_not_enabled():
     # 简化检查
 
 
-@pytest.mark.asyncio
-async def test_query_audit_logs_no_sls_project_name():
+def test_query_audit_logs_no_sls_project_name():
     """测试 SLS 项目名称缺失的情况"""
     handler = module_under_test.ACKAuditLogHandler(None, {"access_key_id": "ak", "access_key_secret": "sk"})
 
@@ -1,11 +1,10 @@
+import asyncio
+import json
 import pytest
 import sys
-import os
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 from datetime import datetime, timezone
-
-# 添加 src 目录到 Python 路径
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from cachetools import TTLCache
 
 import ack_cluster_handler as module_under_test
 from models import (
@@ -54,6 +53,14 @@ class FakeCSClient:
         return FakeResponse(self._clusters_by_call)
 
 
+@pytest.fixture(autouse=True)
+def clear_cluster_region_cache():
+    """各用例之间清空集群 region 缓存，避免相互影响"""
+    module_under_test._CLUSTER_REGION_CACHE.clear()
+    yield
+    module_under_test._CLUSTER_REGION_CACHE.clear()
+
+
 def make_handler_and_tool(settings=None):
     server = FakeServer()
     module_under_test.ACKClusterHandler(server, settings or {})
@@ -293,6 +300,71 @@ def test_serialize_sdk_object_various():
     assert module_under_test._serialize_sdk_object(WithDict()) == {"a": 1}
 
 
+def test_serialize_sdk_object_nested_and_cyclic():
+    class Node:
+        def __init__(self):
+            self.name = "n"
+            self.items = ({"k": [1, None]},)
+            self.parent = self
+
+    result = module_under_test._serialize_sdk_object({"node": Node()})
+    assert result["node"]["name"] == "n"
+    assert result["node"]["items"] == [{"k": [1, None]}]
+    # 循环引用的节点退化为字符串，而不是无限展开
+    assert isinstance(result["node"]["parent"], str)
+
+
+def test_serialize_sdk_object_deeply_nested_beyond_recursion_limit():
+    """测试嵌套层数超过解释器递归上限时仍能完整序列化（迭代展开，不依赖递归）"""
+    class Holder:
+        def __init__(self, child):
+            self.child = child
+
+    depth = sys.getrecursionlimit() + 500
+    obj = None
+    for _ in range(depth):
+        obj = Holder([obj])
+
+    result = module_under_test._serialize_sdk_object({"root": obj})
+    levels = 0
+    node = result["root"]
+    while node is not None:
+        node = node["child"][0]
+        levels += 1
+    assert levels == depth
+
+
+def test_serialize_sdk_object_emits_json_native_types():
+    """测试 datetime、Decimal、bytes 被转换为 JSON 原生类型"""
+    from decimal import Decimal
+
+    created = datetime(2024, 1, 1, 8, 30, tzinfo=timezone.utc)
+    result = module_under_test._serialize_sdk_object(
+        {"created": created, "price": Decimal("1.5"), "raw": b"abc", "items": [created.date()]}
+    )
+
+    assert result == {
+        "created": "2024-01-01T08:30:00+00:00",
+        "price": 1.5,
+        "raw": "abc",
+        "items": ["2024-01-01"],
+    }
+    json.dumps(result)
+
+
+def test_serialize_sdk_object_top_level_to_map_returned_as_is():
+    """顶层 SDK 模型的 to_map() 结果直接返回，不再二次遍历"""
+    payload = {"nodes": [{"instance_id": "i-1"}]}
+
+    class Body:
+        def to_map(self):
+            return payload
+
+    # 第一次调用探测并缓存转换方式，第二次走顶层快速路径
+    assert module_under_test._serialize_sdk_object(Body()) is payload
+    assert module_under_test._serialize_sdk_object(Body()) is payload
+
+
 def test_cluster_info_model():
     """测试 ClusterInfo 数据模型"""
     cluster = ClusterInfo(
@@ -401,8 +473,7 @@ def make_nodepools_handler_and_tool(settings=None):
 class FakeClusterDetailResponse:
     """模拟集群详情响应"""
     def __init__(self, region_id="cn-hangzhou"):
-        self.body = MagicMock()
-        self.body.region_id = region_id
+        self.body = SimpleNamespace(region_id=region_id)
 
 
 class FakeNodePoolDetailResponse:
@@ -414,8 +485,7 @@ class FakeNodePoolDetailResponse:
 class FakeNodePoolsListResponse:
     """模拟节点池列表响应"""
     def __init__(self, nodepools):
-        self.body = MagicMock()
-        self.body.nodepools = nodepools
+        self.body = SimpleNamespace(nodepools=nodepools)
 
 
 class FakeCSClientForNodepools:
@@ -531,6 +601,163 @@ async def test_list_cluster_nodepools_with_nodepool_id():
     assert result.nodepools[0]["nodepool_id"] == "np-1"
 
 
+@pytest.mark.asyncio
+async def test_list_cluster_nodepools_with_nodepool_ids():
+    """测试通过 nodepool_ids 并发获取多个节点池详情，结果按传入顺序返回，重复 ID 只查询一次"""
+    tool = make_nodepools_handler_and_tool()
+    requested = []
+
+    class FakeClient(FakeCSClientForNodepools):
+        async def describe_cluster_node_pool_detail_with_options_async(self, cluster_id, nodepool_id, headers, runtime):
+            requested.append(nodepool_id)
+            await asyncio.sleep(0.01 if nodepool_id == "np-1" else 0)
+            return FakeNodePoolDetailResponse({"nodepool_info": {"nodepool_id": nodepool_id, "name": nodepool_id}})
+
+    def cs_client_factory(region: str, config=None):
+        return FakeClient(region_id="cn-hangzhou")
+
+    ctx = FakeContext({
+        "config": {"access_key_id": "ak", "access_key_secret": "sk"},
+        "providers": {"cs_client_factory": cs_client_factory}
+    })
+
+    result = await tool(
+        ctx, cluster_id="c12345678901234567890123456789012", nodepool_ids=["np-1", "np-2", "np-1"]
+    )
+
+    assert result.error is None
+    assert sorted(requested) == ["np-1", "np-2"]
+    assert [np["nodepool_id"] for np in result.nodepools] == ["np-1", "np-2"]
+    assert result.count == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_nodepool_detail_cached():
+    """测试节点池详情短时缓存：重复查询同一节点池只调用一次 API，且返回副本不影响缓存"""
+    calls = []
+
+    class FakeClient(FakeCSClientForNodepools):
+        async def describe_cluster_node_pool_detail_with_options_async(self, cluster_id, nodepool_id, headers, runtime):
+            calls.append(nodepool_id)
+            return FakeNodePoolDetailResponse({"nodepool_info": {"nodepool_id": nodepool_id}})
+
+    client = FakeClient()
+    serialize = module_under_test._serialize_sdk_object
+    cache = TTLCache(maxsize=16, ttl=60)
+    scope = ("ak", "sk-hash", "cn-hangzhou")
+    first = await module_under_test._fetch_nodepool_detail(client, "c1", "np-1", serialize, cache, scope)
+    first[0]["nodepool_info"]["nodepool_id"] = "mutated"
+    second = await module_under_test._fetch_nodepool_detail(client, "c1", "np-1", serialize, cache, scope)
+    await module_under_test._fetch_nodepool_detail(client, "c1", "np-2", serialize, cache, scope)
+    # 不同凭证不共享缓存；不传 cache 时不缓存
+    await module_under_test._fetch_nodepool_detail(client, "c1", "np-1", serialize, cache, ("ak2", "x", "cn-hangzhou"))
+    await module_under_test._fetch_nodepool_detail(client, "c1", "np-1", serialize)
+
+    assert calls == ["np-1", "np-2", "np-1", "np-1"]
+    assert second == [{"nodepool_info": {"nodepool_id": "np-1"}}]
+
+
+@pytest.mark.asyncio
+async def test_list_cluster_nodepools_detail_cache_per_handler_and_invalidated():
+    """测试节点池详情缓存挂在 handler 上、按凭证隔离，并可在变更后失效"""
+    server = FakeServer()
+    handler = module_under_test.ACKClusterHandler(server, {"detail_cache_ttl": 60})
+    tool = server.tools["list_cluster_nodepools"]
+    calls = []
+
+    class FakeClient(FakeCSClientForNodepools):
+        async def describe_cluster_node_pool_detail_with_options_async(self, cluster_id, nodepool_id, headers, runtime):
+            calls.append(nodepool_id)
+            return FakeNodePoolDetailResponse({"nodepool_info": {"nodepool_id": nodepool_id}})
+
+    def make_ctx(ak):
+        return FakeContext({
+            "config": {"access_key_id": ak, "access_key_secret": "sk"},
+            "providers": {"cs_client_factory": lambda region, config=None: FakeClient(region_id="cn-hangzhou")},
+        })
+
+    cluster_id = "c12345678901234567890123456789012"
+    await tool(make_ctx("ak"), cluster_id=cluster_id, nodepool_id="np-1")
+    await tool(make_ctx("ak"), cluster_id=cluster_id, nodepool_id="np-1")
+    assert calls == ["np-1"]
+
+    await tool(make_ctx("other-ak"), cluster_id=cluster_id, nodepool_id="np-1")
+    assert calls == ["np-1", "np-1"]
+
+    handler.invalidate_nodepool_detail(cluster_id, "np-1")
+    await tool(make_ctx("ak"), cluster_id=cluster_id, nodepool_id="np-1")
+    assert calls == ["np-1", "np-1", "np-1"]
+
+    # detail_cache_ttl=0 时不缓存
+    assert module_under_test.ACKClusterHandler(None, {"detail_cache_ttl": 0})._detail_cache is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_nodepool_details_cancels_pending_on_failure():
+    """测试并发查询节点池详情时，任一查询失败即取消其余查询，并抛出原始异常"""
+    cancelled = []
+
+    class FakeClient(FakeCSClientForNodepools):
+        async def describe_cluster_node_pool_detail_with_options_async(self, cluster_id, nodepool_id, headers, runtime):
+            if nodepool_id == "np-bad":
+                raise ValueError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(nodepool_id)
+                raise
+
+    with pytest.raises(ValueError, match="boom"):
+        await module_under_test._fetch_nodepool_details(
+            FakeClient(), "c1", ["np-1", "np-bad", "np-2"], module_under_test._serialize_sdk_object
+        )
+
+    assert sorted(cancelled) == ["np-1", "np-2"]
+
+
+@pytest.mark.asyncio
+async def test_list_cluster_nodepools_with_too_many_nodepool_ids():
+    """测试 nodepool_ids 超过数量上限时返回结构化错误，不发起任何查询"""
+    tool = make_nodepools_handler_and_tool()
+
+    def cs_client_factory(region: str, config=None):
+        return FakeCSClientForNodepools(region_id="cn-hangzhou")
+
+    ctx = FakeContext({
+        "config": {"access_key_id": "ak", "access_key_secret": "sk"},
+        "providers": {"cs_client_factory": cs_client_factory}
+    })
+
+    result = await tool(
+        ctx, cluster_id="c12345678901234567890123456789012", nodepool_ids=[f"np-{i}" for i in range(51)]
+    )
+
+    assert result.count == 0
+    assert result.error is not None
+    assert result.error.error_code == ClusterErrorCodes.INVALID_NODEPOOL_IDS
+
+
+@pytest.mark.asyncio
+async def test_list_cluster_nodepools_rejects_nodepool_id_with_nodepool_ids():
+    """测试同时指定 nodepool_id 与 nodepool_ids 时返回结构化错误"""
+    tool = make_nodepools_handler_and_tool()
+
+    def cs_client_factory(region: str, config=None):
+        raise AssertionError("参数校验失败时不应创建 CS 客户端")
+
+    ctx = FakeContext({
+        "config": {"access_key_id": "ak", "access_key_secret": "sk"},
+        "providers": {"cs_client_factory": cs_client_factory}
+    })
+
+    result = await tool(
+        ctx, cluster_id="c12345678901234567890123456789012", nodepool_id="np-1", nodepool_ids=["np-2"]
+    )
+
+    assert result.count == 0
+    assert result.error.error_code == ClusterErrorCodes.INVALID_NODEPOOL_IDS
+
+
 @pytest.mark.asyncio
 async def test_list_cluster_nodepools_empty():
     """测试空节点池列表"""
@@ -586,8 +813,7 @@ def make_nodes_handler_and_tool(settings=None):
 class FakeNodesResponse:
     """模拟节点列表响应"""
     def __init__(self, nodes, page_info=None):
-        self.body = MagicMock()
-        self.body.nodes = nodes
+        self.body = SimpleNamespace(nodes=nodes)
         if page_info:
             self.body.page_info = page_info
             self.body.pageInfo = page_info
@@ -737,6 +963,24 @@ async def test_list_cluster_nodes_with_instance_ids():
     assert result.nodes[0]["instance_id"] == "i-123456"
 
 
+@pytest.mark.asyncio
+async def test_fetch_nodes_page_with_instance_ids_and_node_names():
+    """测试 instance_ids 与 node_names 同时传入时，节点需同时满足两者"""
+    fake_nodes = [
+        {"instance_id": "i-1", "node_name": "node-1"},
+        {"instance_id": "i-2", "node_name": "node-2"},
+        {"instance_id": "i-3", "node_name": "node-3"},
+    ]
+    client = FakeCSClientForNodes(nodes_data=fake_nodes)
+
+    nodes, _ = await module_under_test._fetch_nodes_page(
+        client, "c1", 1, 10, None, module_under_test._serialize_sdk_object,
+        instance_ids=["i-1", "i-2"], node_names=["node-2", "node-3"],
+    )
+
+    assert [n["instance_id"] for n in nodes] == ["i-2"]
+
+
 @pytest.mark.asyncio
 async def test_list_cluster_nodes_error():
     """测试节点查询错误"""
@@ -1275,3 +1519,316 @@ async def test_list_cluster_tasks_fetch_both_fail_states_when_query_fail():
     assert isinstance(result, ListClusterTasksOutput)
     # 由于内部会查询两次 (fail + failed)，应该得到两种状态的任务
     # 验证内部逻辑会同时查询两个失败状态
+
+
+@pytest.mark.asyncio
+async def test_fetch_tasks_page_query_only_includes_set_filters():
+    """测试 _fetch_tasks_page 只在参数非 None 时附加 state/type/target_id"""
+    captured = []
+
+    class RecordingClient:
+        async def call_api_async(self, params, request, runtime):
+            captured.append(request.query)
+            return {"body": {"tasks": [], "page_info": {}}}
+
+    client = RecordingClient()
+    await module_under_test._fetch_tasks_page(
+        client, "c12345678901234567890123456789012", 1, 10, module_under_test._serialize_sdk_object
+    )
+    await module_under_test._fetch_tasks_page(
+        client,
+        "c12345678901234567890123456789012",
+        2,
+        20,
+        module_under_test._serialize_sdk_object,
+        state=module_under_test.ClusterTaskState.RUNNING,
+        task_type=module_under_test.ClusterTaskType.NODEPOOL_SCALEOUT,
+        target_id="np-1",
+    )
+
+    assert captured[0] == {"page_number": "1", "page_size": "10", "detail": "true"}
+    assert captured[1]["state"] == "running"
+    assert captured[1]["type"] == "nodepool_scaleout"
+    assert captured[1]["target_id"] == "np-1"
+
+
+def test_describe_tasks_params_reused_per_cluster():
+    """测试 DescribeClusterTasks 的 Params 按集群复用，且 pathname 指向对应集群"""
+    first = module_under_test._describe_tasks_params("c-1")
+    assert module_under_test._describe_tasks_params("c-1") is first
+    assert first.pathname == "/clusters/c-1/tasks"
+    assert module_under_test._describe_tasks_params("c-2").pathname == "/clusters/c-2/tasks"
+
+
+@pytest.mark.asyncio
+async def test_fetch_tasks_page_uses_json_tasks_without_serializing():
+    """测试 call_api 返回的纯 JSON 任务列表不再经 serialize 遍历"""
+    tasks_data = [{"task_id": "t-1", "state": "running"}, {"task_id": "t-2", "state": "success"}]
+    serialized = []
+
+    def recording_serialize(obj):
+        serialized.append(obj)
+        return module_under_test._serialize_sdk_object(obj)
+
+    client = FakeCSClientForTasks(tasks_data=tasks_data, page_info={"total_count": 2})
+    tasks, page_info = await module_under_test._fetch_tasks_page(
+        client, "c12345678901234567890123456789012", 1, 10, recording_serialize
+    )
+
+    assert tasks == tasks_data and tasks is not tasks_data
+    assert page_info == {"total_count": 2}
+    assert tasks_data not in serialized
+
+
+@pytest.mark.asyncio
+async def test_get_cluster_region_is_cached():
+    """测试集群 region 查询结果会被缓存，重复调用不再请求 DescribeClusterDetail"""
+    calls = []
+
+    class DetailClient:
+        async def describe_cluster_detail_async(self, cluster_id):
+            calls.append(cluster_id)
+            return FakeClusterDetailResponse("cn-beijing")
+
+    ctx = FakeContext({
+        "config": {"access_key_id": "ak", "access_key_secret": "sk"},
+        "providers": {"cs_client_factory": lambda region, config=None: DetailClient()}
+    })
+
+    first = await module_under_test._get_cluster_region(ctx, "c12345678901234567890123456789012")
+    second = await module_under_test._get_cluster_region(ctx, "c12345678901234567890123456789012")
+
+    assert first == second == "cn-beijing"
+    assert calls == ["c12345678901234567890123456789012"]
+
+
+def test_time_helpers_tolerate_invalid_input():
+    """测试时间解析对非法输入返回 None 而不是抛异常"""
+    from ack_cluster_helpers import parse_task_time, parse_time_range
+
+    assert parse_task_time("not-a-time") is None
+    assert parse_time_range("xm", "not-a-time") == (None, None)
+    assert parse_time_range("9999999999d", None) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_get_cluster_region_coalesces_concurrent_lookups():
+    """测试同一集群的并发 region 查询只触发一次 DescribeClusterDetail"""
+    import asyncio
+
+    calls = []
+
+    class SlowDetailClient:
+        async def describe_cluster_detail_async(self, cluster_id):
+            calls.append(cluster_id)
+            await asyncio.sleep(0.01)
+            return FakeClusterDetailResponse("cn-shanghai")
+
+    ctx = FakeContext({
+        "config": {"access_key_id": "ak", "access_key_secret": "sk"},
+        "providers": {"cs_client_factory": lambda region, config=None: SlowDetailClient()}
+    })
+
+    regions = await asyncio.gather(
+        *(module_under_test._get_cluster_region(ctx, "c12345678901234567890123456789012") for _ in range(5))
+    )
+
+    assert regions == ["cn-shanghai"] * 5
+    assert len(calls) == 1
+    assert not module_under_test._CLUSTER_REGION_INFLIGHT
+
+
+@pytest.mark.asyncio
+async def test_serialize_items_offloads_large_lists():
+    """测试大列表在线程中序列化，小列表同步序列化，结果一致"""
+    import threading
+
+    threads = []
+
+    def recording_serialize(obj):
+        threads.append(threading.current_thread())
+        return module_under_test._serialize_sdk_object(obj)
+
+    small = [{"i": i} for i in range(3)]
+    large = [{"i": i} for i in range(module_under_test._SERIALIZE_OFFLOAD_THRESHOLD + 1)]
+
+    assert await module_under_test._serialize_items(recording_serialize, small) == small
+    assert await module_under_test._serialize_items(recording_serialize, large) == large
+    assert threads[0] is threading.main_thread()
+    assert threads[1] is not threading.main_thread()
+
+
+def test_task_matches_filters_node_name_and_instance_id():
+    """测试 node_name 与 instance_id 取并集匹配，且为精确匹配"""
+    from ack_cluster_helpers import task_matches_filters
+
+    task = {"task_id": "t-1", "task": {"target": {"nodes": ["node-a"], "instances": ["i-123"]}}}
+
+    assert task_matches_filters(task, None, None, None, "node-a")
+    assert task_matches_filters(task, None, None, "i-123", None)
+    assert task_matches_filters(task, None, None, "i-999", "node-a")
+    assert not task_matches_filters(task, None, None, "i-12", None)
+    assert not task_matches_filters(task, None, None, "i-999", "node-b")
+    assert task_matches_filters(task, None, None, None, None)
+
+
+def test_filter_nodepool_field_fallbacks():
+    """测试节点池字段按 nodepool_info/status 优先、顶层兜底取值，None 字段不输出"""
+    from ack_cluster_helpers import filter_nodepool
+
+    nodepool = {
+        "nodepool_info": {"nodepoolId": "np-1", "name": "", "is_default": False},
+        "status": {"state": "active", "total_nodes": 0},
+        "name": "top-name",
+        "total_nodes": 3,
+        "extra": "ignored",
+    }
+
+    assert filter_nodepool(nodepool) == {
+        "nodepool_id": "np-1",
+        "name": "top-name",
+        "state": "active",
+        "total_nodes": 3,
+    }
+    assert filter_nodepool("not-a-dict") == {}
+
+
+@pytest.mark.asyncio
+async def test_list_cluster_nodepools_serializes_only_requested_page():
+    """测试节点池分页时只序列化当前页"""
+    nodepools = [{"nodepool_info": {"nodepool_id": f"np-{i}", "name": f"pool-{i}"}} for i in range(5)]
+    serialized = []
+
+    def recording_serialize(obj):
+        serialized.append(obj)
+        return module_under_test._serialize_sdk_object(obj)
+
+    client = FakeCSClientForNodepools(nodepools_data=nodepools)
+    page, total = await module_under_test._fetch_nodepools_list(
+        client, "c12345678901234567890123456789012", recording_serialize, start=2, limit=2
+    )
+
+    assert total == 5
+    assert [p["nodepool_info"]["nodepool_id"] for p in page] == ["np-2", "np-3"]
+    assert serialized == [nodepools[2:4]]
+
+
+@pytest.mark.asyncio
+async def test_with_read_retry_retries_transient_errors(monkeypatch):
+    """测试只读调用遇到限流 / 5xx 时重试，非瞬时错误直接抛出"""
+    from Tea.exceptions import TeaException
+
+    monkeypatch.setattr(module_under_test, "_READ_RETRY_BASE_DELAY", 0)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise TeaException({"code": "Throttling.User", "message": "throttled"})
+        if len(attempts) == 2:
+            raise TeaException({"code": "InternalError", "data": {"statusCode": 503}})
+        return "ok"
+
+    assert await module_under_test._with_read_retry(flaky) == "ok"
+    assert len(attempts) == 3
+
+    calls = []
+
+    async def forbidden():
+        calls.append(1)
+        raise TeaException({"code": "Forbidden.RAM", "data": {"statusCode": 403}})
+
+    with pytest.raises(TeaException):
+        await module_under_test._with_read_retry(forbidden)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_with_read_retry_gives_up_after_max_attempts(monkeypatch):
+    """测试瞬时错误持续出现时，达到最大次数后抛出最后一次异常"""
+    from Tea.exceptions import TeaException
+
+    monkeypatch.setattr(module_under_test, "_READ_RETRY_BASE_DELAY", 0)
+    calls = []
+
+    async def always_throttled():
+        calls.append(1)
+        raise TeaException({"code": "Throttling", "message": "throttled"})
+
+    with pytest.raises(TeaException):
+        await module_under_test._with_read_retry(always_throttled)
+    assert len(calls) == module_under_test._READ_RETRY_ATTEMPTS
+
+
+def test_is_transient_sdk_error_unretryable_only_for_network_errors():
+    """测试 UnretryableException 仅在内部为网络/超时错误时重试，SDK 内部的程序错误不重试"""
+    from Tea.exceptions import UnretryableException
+    import aiohttp
+
+    is_transient = module_under_test._is_transient_sdk_error
+    assert is_transient(UnretryableException(None, ConnectionResetError("reset")))
+    assert is_transient(UnretryableException(None, TimeoutError()))
+    assert is_transient(UnretryableException(None, aiohttp.ServerDisconnectedError()))
+    assert not is_transient(UnretryableException(None, TypeError("bad argument")))
+    assert not is_transient(UnretryableException(None, ValueError("bad value")))
+
+
+def test_is_transient_sdk_error_5xx_without_response_body():
+    """测试响应体为空（data 中没有 statusCode）的 5xx 也会重试，4xx 不重试"""
+    from Tea.exceptions import TeaException
+
+    is_transient = module_under_test._is_transient_sdk_error
+    no_body = TeaException({"code": "ServiceUnavailable", "data": {}})
+    no_body.status_code = 503
+    assert is_transient(no_body)
+    assert is_transient(TeaException({"code": "InternalError", "data": {"httpCode": "502"}}))
+
+    client_error = TeaException({"code": "InvalidParameter", "data": {}})
+    client_error.status_code = 400
+    assert not is_transient(client_error)
+    assert not is_transient(TeaException({"code": "InvalidParameter", "data": None}))
+
+
+@pytest.mark.asyncio
+async def test_cs_requests_bounded_by_max_inflight_setting():
+    """测试 max_inflight_cs_requests 限制同一 handler 同时在途的 CS 请求数"""
+    tool = make_nodepools_handler_and_tool({"max_inflight_cs_requests": 2})
+    inflight = []
+    peak = []
+
+    class SlowClient(FakeCSClientForNodepools):
+        async def describe_cluster_node_pool_detail_with_options_async(self, cluster_id, nodepool_id, headers, runtime):
+            inflight.append(nodepool_id)
+            peak.append(len(inflight))
+            await asyncio.sleep(0.01)
+            inflight.remove(nodepool_id)
+            return FakeNodePoolDetailResponse({"nodepool_info": {"nodepool_id": nodepool_id}})
+
+    def cs_client_factory(region: str, config=None):
+        return SlowClient(region_id="cn-hangzhou")
+
+    ctx = FakeContext({
+        "config": {"access_key_id": "ak", "access_key_secret": "sk"},
+        "providers": {"cs_client_factory": cs_client_factory}
+    })
+
+    result = await tool(
+        ctx, cluster_id="c12345678901234567890123456789012", nodepool_ids=[f"np-{i}" for i in range(6)]
+    )
+
+    assert result.count == 6
+    assert max(peak) == 2
+
+
+def test_parse_cluster_info_skips_malformed_records():
+    """测试单条集群数据结构异常或字段校验失败时返回 None，而不是中断整个列表"""
+    assert module_under_test._parse_cluster_info(None) is None
+    assert module_under_test._parse_cluster_info(
+        {"name": "c1", "cluster_id": "cls-1", "state": "running", "cluster_type": "ManagedKubernetes",
+         "vswitch_ids": "not-a-list"}
+    ) is None
+    info = module_under_test._parse_cluster_info(
+        {"name": "c1", "cluster_id": "cls-1", "state": "running", "cluster_type": "ManagedKubernetes",
+         "region_id": "cn-hangzhou", "vswitch_ids": [], "tags": []}
+    )
+    assert info.cluster_id == "cls-1"
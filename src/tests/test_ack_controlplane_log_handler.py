@@ -1,12 +1,7 @@
 import pytest
-import sys
-import os
-from unittest.mock import Mock
+from types import SimpleNamespace
 from datetime import datetime, timedelta
 
-# 添加 src 目录到 Python 路径
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 import ack_controlplane_log_handler as module_under_test
 from models import (
     QueryControlPlaneLogsOutput, 
@@ -39,8 +34,7 @@ class FakeContext:
 
 class FakeSLSResponse:
     def __init__(self, logs=None):
-        self.body = Mock()
-        self.body.logs = logs or []
+        self.body = SimpleNamespace(logs=logs or [])
 
 
 class FakeSLSClient:
@@ -115,6 +109,14 @@ class FakeSLSClientFactory:
         return FakeSLSClient(self.response_logs)
 
 
+@pytest.fixture(autouse=True)
+def clear_controlplane_log_config_cache():
+    """各用例之间清空控制面日志配置缓存，避免相互影响"""
+    module_under_test._CONTROLPLANE_LOG_CONFIG_CACHE.clear()
+    yield
+    module_under_test._CONTROLPLANE_LOG_CONFIG_CACHE.clear()
+
+
 def make_handler_and_tool(settings=None, tool_name="query_controlplane_logs"):
     server = FakeServer()
     handler = module_under_test.ACKControlPlaneLogHandler(server, settings)
@@ -254,6 +256,50 @@ async def test_query_controlplane_logs_no_components():
     assert "not enable" in result.error.error_message
 
 
+def test_controlplane_log_config_cached_per_cluster():
+    """测试控制面日志配置按凭证与集群缓存：重复查询只调用一次 CheckControlPlaneLogEnable，命中时保留首次的请求 ID；未开启时不缓存"""
+    calls = []
+
+    class CountingCSClient(FakeCSClient):
+        def check_control_plane_log_enable_with_options(self, cluster_id, headers, runtime):
+            calls.append(cluster_id)
+            response = super().check_control_plane_log_enable_with_options(cluster_id, headers, runtime)
+            response.headers = {"x-acs-request-id": f"req-{len(calls)}"}
+            return response
+
+    def make_ctx(access_key_id):
+        return FakeContext({
+            "config": {"access_key_id": access_key_id, "access_key_secret": "sk"},
+            "providers": {"cs_client_factory": lambda region_id, config=None: CountingCSClient()},
+        })
+
+    first, first_request_id, err, first_from_cache = module_under_test._get_controlplane_log_config(
+        make_ctx("ak"), "c-1", "cn-hangzhou"
+    )
+    second, request_id, _, from_cache = module_under_test._get_controlplane_log_config(
+        make_ctx("ak"), "c-1", "cn-hangzhou"
+    )
+
+    assert err is None
+    assert second is first
+    assert (first_from_cache, from_cache) == (False, True)
+    assert request_id == first_request_id == "req-1"
+    assert calls == ["c-1"]
+
+    # 不同凭证不共享缓存
+    module_under_test._get_controlplane_log_config(make_ctx("other-ak"), "c-1", "cn-hangzhou")
+    assert calls == ["c-1", "c-1"]
+
+    disabled_ctx = FakeContext({
+        "config": {},
+        "providers": {"cs_client_factory": lambda region_id, config=None: FakeCSClient(components=[])},
+    })
+    for _ in range(2):
+        config, _, err, from_cache = module_under_test._get_controlplane_log_config(disabled_ctx, "c-2", "cn-hangzhou")
+        assert config is None and err and not from_cache
+    assert all(key[-1] != "c-2" for key in module_under_test._CONTROLPLANE_LOG_CONFIG_CACHE)
+
+
 @pytest.mark.asyncio
 async def test_query_controlplane_logs_missing_cluster_id():
     """测试缺少集群ID"""
@@ -1,10 +1,5 @@
-import os
-import sys
 import pytest
 
-# 添加 src 目录到路径
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 import ack_prometheus_handler as module_under_test
 
 
@@ -30,6 +25,13 @@ class FakeContext:
         self.request_context = FakeRequestContext(lifespan_context)
 
 
+@pytest.fixture(autouse=True)
+def clear_arms_endpoint_cache():
+    module_under_test._ARMS_ENDPOINT_CACHE.clear()
+    yield
+    module_under_test._ARMS_ENDPOINT_CACHE.clear()
+
+
 def make_handler_and_tools():
     server = FakeServer()
     handler = module_under_test.PrometheusHandler(server, {})
@@ -335,3 +337,40 @@ async def test_query_prometheus_metric_guidance_case_insensitive():
     assert result.promql_samples[0].rule_name == "CPU High"
 
 
+def test_resolve_from_arms_caches_endpoint():
+    """测试 ARMS 解析到的 Prometheus 地址按凭证与集群短时缓存，重复解析不再调用 ARMS"""
+    from types import SimpleNamespace
+
+    handler, _ = make_handler_and_tools()
+    arms_calls = []
+
+    class FakeCSClient:
+        def describe_cluster_detail(self, cluster_id):
+            return SimpleNamespace(headers={}, body=SimpleNamespace(region_id="cn-hangzhou"))
+
+    class FakeARMSClient:
+        def get_prometheus_instance_with_options(self, req, runtime):
+            arms_calls.append(req.cluster_id)
+            data = SimpleNamespace(http_api_inter_url="http://prom.example.com/", http_api_intra_url=None)
+            return SimpleNamespace(headers={}, body=SimpleNamespace(data=data))
+
+    providers = {
+        "cs_client_factory": lambda region, config=None: FakeCSClient(),
+        "arms_client_factory": lambda region, config=None: FakeARMSClient(),
+    }
+    ctx = FakeContext({"config": {"access_key_id": "ak", "access_key_secret": "sk"}, "providers": providers})
+    other_ctx = FakeContext({"config": {"access_key_id": "other-ak", "access_key_secret": "sk"}, "providers": providers})
+
+    first_log = module_under_test.ExecutionLog(tool_call_id="t1", start_time="now")
+    second_log = module_under_test.ExecutionLog(tool_call_id="t2", start_time="now")
+    first = handler._resolve_from_arms(ctx, providers, "c-1", first_log)
+    second = handler._resolve_from_arms(ctx, providers, "c-1", second_log)
+
+    assert first == second == "http://prom.example.com"
+    assert arms_calls == ["c-1"]
+    assert second_log.api_calls[-1]["source"] == "cache"
+    assert second_log.api_calls[-1]["region_id"] == "cn-hangzhou"
+
+    # 不同凭证不共享缓存
+    handler._resolve_from_arms(other_ctx, providers, "c-1", module_under_test.ExecutionLog(tool_call_id="t3", start_time="now"))
+    assert arms_calls == ["c-1", "c-1"]
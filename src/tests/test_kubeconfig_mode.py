@@ -1,12 +1,8 @@
 import os
-import sys
 import tempfile
 import pytest
 from unittest.mock import patch, MagicMock, mock_open
 
-# 添加父目录到路径以导入模块
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 import kubectl_handler as module_under_test
 
 
@@ -72,9 +68,9 @@ def context_manager():
     module_under_test._context_manager = None
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def temp_kubeconfig_file():
-    """创建一个临时kubeconfig文件用于测试"""
+    """创建一个临时kubeconfig文件用于测试（只读，模块内共享）"""
     with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
         f.write("apiVersion: v1\nclusters:\n- cluster:\n    server: https://test.example.com:6443\nusers:\n- name: test-user\n  user:\n    token: test-token")
         temp_path = f.name
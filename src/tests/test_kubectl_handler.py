@@ -1,11 +1,4 @@
-import types
 import pytest
-import tempfile
-import os
-import sys
-
-# 添加父目录到路径以导入模块
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 import kubectl_handler as module_under_test
 
@@ -546,3 +539,29 @@ async def test_write_command_blocked_in_readonly_mode(monkeypatch):
     assert result.exit_code == 0
     assert result.stdout == "pods found"
 
+
+
+@pytest.mark.asyncio
+async def test_write_command_rejected_before_cs_client_setup():
+    """测试只读模式下写命令在初始化 CS 客户端之前就被拒绝"""
+    module_under_test._context_manager = None
+
+    server = FakeServer()
+    module_under_test.KubectlHandler(server, {"allow_write": False})
+    tool = server.tools["ack_kubectl"]
+
+    factory_calls = []
+
+    def cs_client_factory(region_id, config=None):
+        factory_calls.append(region_id)
+        raise AssertionError("cs_client_factory should not be called for rejected commands")
+
+    ctx = FakeContext({"providers": {"cs_client_factory": cs_client_factory}, "config": {}})
+
+    result = await tool(ctx, command="delete pod my-pod", cluster_id="test-cluster")
+    assert result.exit_code == 1
+    assert "not allowed in read-only mode" in result.stderr
+
+    result = await tool(ctx, command="edit deployment my-deploy", cluster_id="test-cluster")
+    assert result.exit_code == 1
+    assert factory_calls == []
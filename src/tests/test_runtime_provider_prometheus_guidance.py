@@ -1,12 +1,8 @@
 import json
 import os
-import sys
 import tempfile
 from unittest.mock import patch
 
-# 添加 src 目录到路径
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 import runtime_provider as module_under_test
 
 
@@ -310,3 +306,50 @@ class TestPrometheusGuidance:
             
             assert len(memory_result) == 1
             assert memory_result[0]["metric"]["name"] == "metric2"
+
+
+    def test_guidance_loaded_once_across_queries(self):
+        """测试指引数据首次成功加载后复用，多次查询不再重复读取文件"""
+        test_guidance = {
+            "metrics_dictionary": {"m": {"metrics": [{"name": "metric1", "category": "cpu", "labels": ["pod"]}]}},
+            "promql_best_practice": {"p": {"rules": [{"name": "rule1", "category": "cpu", "labels": ["pod"]}]}},
+            "initialized": True,
+            "error": None,
+        }
+        with patch.object(self.provider, 'initialize_prometheus_guidance', return_value=test_guidance) as mock_init:
+            self.provider.query_metrics_by_category_and_label("cpu", "pod")
+            self.provider.query_promql_practices_by_category_and_label("cpu", "pod")
+            self.provider.query_metrics_by_category_and_label("memory", "pod")
+
+        assert mock_init.call_count == 1
+
+
+class TestCSClientFactory:
+    """测试 CS 客户端工厂的复用行为"""
+
+    def test_cs_client_factory_reuses_client_per_region_and_ak(self):
+        provider = module_under_test.ACKClusterRuntimeProvider()
+        with patch.object(provider, 'initialize_prometheus_guidance', return_value={}):
+            providers = provider.initialize_providers({})
+        factory = providers["cs_client_factory"]
+        cfg = {"access_key_id": "ak", "access_key_secret": "sk"}
+
+        hangzhou = factory("cn-hangzhou", cfg)
+        assert factory("cn-hangzhou", dict(cfg)) is hangzhou
+        assert factory("cn-beijing", cfg) is not hangzhou
+        assert factory("cn-hangzhou", {"access_key_id": "ak2", "access_key_secret": "sk"}) is not hangzhou
+        assert factory("CENTER", cfg) is factory("CENTER", cfg)
+
+    def test_arms_and_sls_client_factories_reuse_clients(self):
+        provider = module_under_test.ACKClusterRuntimeProvider()
+        with patch.object(provider, 'initialize_prometheus_guidance', return_value={}):
+            providers = provider.initialize_providers({})
+        cfg = {"access_key_id": "ak", "access_key_secret": "sk"}
+
+        arms = providers["arms_client_factory"]
+        assert arms("cn-hangzhou", cfg) is arms("cn-hangzhou", cfg)
+        assert arms("cn-beijing", cfg) is not arms("cn-hangzhou", cfg)
+
+        sls = providers["sls_client_factory"]
+        assert sls("cn-hangzhou", cfg) is sls("cn-hangzhou", cfg)
+        assert sls("cn-beijing", cfg) is not sls("cn-hangzhou", cfg)
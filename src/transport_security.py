@@ -64,7 +64,7 @@ class TransportSecurityMiddleware(Middleware):
                 if origin.startswith(base_origin + ":"):
                     return True
 
-        logger.warning(f"Invalid Origin header: {origin}")
+        logger.warning("Invalid Origin header: {}", origin)
         return False
 
     async def validate_request(self, request: Request) -> str | None:
@@ -89,7 +89,7 @@ class TransportSecurityMiddleware(Middleware):
         call_next: CallNext[mt.Request[Any, Any], Any],
     ) -> Any:
         request = get_http_request()
-        logger.debug(f"Request Headers: {request.headers}")
+        logger.debug("Request Headers: {}", request.headers)
         err = await self.validate_request(request)
         if err:
             raise ValidationError(err)